@@ -0,0 +1,114 @@
+"""
+Artifact download auditing for Muelsyse-CI
+
+Download records are buffered in-process and written in batches so the
+download response does not wait on an INSERT. The audit log is
+eventually consistent: rows appear within flush_interval seconds.
+"""
+import atexit
+import logging
+import threading
+
+from django.db import IntegrityError, connection
+
+logger = logging.getLogger(__name__)
+
+# Matches ArtifactDownload.user_agent
+USER_AGENT_MAX_LENGTH = 500
+
+
+class DownloadBuffer:
+    """
+    Thread-safe buffer of pending ArtifactDownload rows.
+
+    Flushes when flush_size entries are pending, or flush_interval seconds
+    after the first entry was added, whichever comes first.
+    """
+
+    def __init__(self, flush_size: int = 500, flush_interval: float = 2.0):
+        self.buffer = []
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def enqueue(self, artifact_id, user_id, ip, ua, ts) -> None:
+        """Queue a download record. Rows are built at flush time."""
+        with self._lock:
+            self.buffer.append((artifact_id, user_id, ip, ua, ts))
+            full = len(self.buffer) >= self.flush_size
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self._run_flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write pending records to the database and return how many."""
+        from apps.artifacts.models import Artifact, ArtifactDownload
+
+        with self._lock:
+            entries, self.buffer = self.buffer, []
+
+        if not entries:
+            return 0
+
+        downloads = [
+            ArtifactDownload(
+                artifact_id=artifact_id,
+                downloaded_by_id=user_id,
+                ip_address=ip,
+                user_agent=(ua or '')[:USER_AGENT_MAX_LENGTH],
+                downloaded_at=ts,
+            )
+            for artifact_id, user_id, ip, ua, ts in entries
+        ]
+
+        try:
+            ArtifactDownload.objects.bulk_create(downloads, batch_size=500)
+        except IntegrityError:
+            # An artifact or user was deleted after its download was queued:
+            # drop rows for missing artifacts and null out missing users, as
+            # CASCADE and SET_NULL would have done
+            existing = set(Artifact.objects.filter(
+                id__in={d.artifact_id for d in downloads}
+            ).values_list('id', flat=True))
+            downloads = [d for d in downloads if d.artifact_id in existing]
+
+            User = ArtifactDownload._meta.get_field('downloaded_by').related_model
+            existing_users = set(User.objects.filter(
+                id__in={d.downloaded_by_id for d in downloads if d.downloaded_by_id}
+            ).values_list('id', flat=True))
+            for download in downloads:
+                if download.downloaded_by_id not in existing_users:
+                    download.downloaded_by_id = None
+
+            ArtifactDownload.objects.bulk_create(downloads, batch_size=500)
+
+        return len(downloads)
+
+    def _run_flush(self) -> None:
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Failed to flush artifact download records")
+        finally:
+            # The timer thread owns its own connection
+            connection.close()
+
+
+download_buffer = DownloadBuffer()
+
+
+def _flush_at_exit() -> None:
+    try:
+        download_buffer.flush()
+    except Exception:
+        logger.exception("Failed to flush artifact download records on shutdown")
+
+
+atexit.register(_flush_at_exit)
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 00:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0002_initial'),
+        ('executions', '0001_initial'),
+        ('tenants', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='artifact',
+            index=models.Index(fields=['tenant', 'expires_at'], name='artifacts_a_tenant__8f461c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='artifact',
+            index=models.Index(fields=['tenant', 'execution', 'name'], name='artifacts_a_tenant__ce815f_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-16 00:41
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0003_artifact_tenant_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='artifactdownload',
+            name='downloaded_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
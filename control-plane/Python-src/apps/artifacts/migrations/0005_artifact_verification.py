@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 00:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0004_artifactdownload_downloaded_at_default'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artifact',
+            name='last_verified_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='artifact',
+            name='source_mtime',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
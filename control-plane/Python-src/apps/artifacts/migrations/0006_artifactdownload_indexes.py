@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 00:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0005_artifact_verification'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='artifactdownload',
+            index=models.Index(fields=['artifact', '-downloaded_at'], name='artifacts_a_artifac_58d16a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='artifactdownload',
+            index=models.Index(fields=['-downloaded_at'], name='artifacts_a_downloa_fda9e8_idx'),
+        ),
+    ]
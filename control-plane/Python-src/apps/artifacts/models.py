@@ -4,6 +4,9 @@ Artifact models for Muelsyse-CI
 This module contains models for storing build artifacts.
 """
 import uuid
+import hashlib
+from pathlib import Path
+from django.conf import settings
 from django.db import models
 from django.utils import timezone
 
@@ -41,6 +44,10 @@ class Artifact(TenantAwareModel):
     size_bytes = models.BigIntegerField()
     checksum_sha256 = models.CharField(max_length=64)
 
+    # Verification (file mtime in ns when checksum_sha256 was last confirmed)
+    source_mtime = models.BigIntegerField(null=True, blank=True)
+    last_verified_at = models.DateTimeField(null=True, blank=True)
+
     # Retention
     retention_days = models.PositiveIntegerField(default=30)
     expires_at = models.DateTimeField()
@@ -59,6 +66,8 @@ class Artifact(TenantAwareModel):
         indexes = [
             models.Index(fields=['execution', 'name']),
             models.Index(fields=['expires_at']),
+            models.Index(fields=['tenant', 'expires_at']),
+            models.Index(fields=['tenant', 'execution', 'name']),
         ]
 
     def __str__(self):
@@ -79,6 +88,45 @@ class Artifact(TenantAwareModel):
     def size_mb(self) -> float:
         return self.size_bytes / (1024 * 1024)
 
+    @property
+    def local_path(self) -> Path:
+        return Path(settings.ARTIFACT_STORAGE_PATH) / self.storage_path
+
+    def verify_checksum(self) -> bool:
+        """
+        Verify the stored file against checksum_sha256.
+
+        The file is only re-hashed when its size or mtime differ from the
+        last successful verification. Only the local backend is checked.
+        """
+        if settings.ARTIFACT_STORAGE_BACKEND != 'local':
+            return True
+
+        path = self.local_path
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return False
+
+        if stat.st_size != self.size_bytes:
+            return False
+        if stat.st_mtime_ns == self.source_mtime:
+            return True
+
+        with open(path, 'rb') as f:
+            digest = hashlib.file_digest(f, 'sha256').hexdigest()
+
+        if digest != self.checksum_sha256:
+            return False
+
+        self.source_mtime = stat.st_mtime_ns
+        self.last_verified_at = timezone.now()
+        Artifact.objects.filter(pk=self.pk).update(
+            source_mtime=self.source_mtime,
+            last_verified_at=self.last_verified_at,
+        )
+        return True
+
 
 class ArtifactDownload(models.Model):
     """
@@ -100,10 +148,15 @@ class ArtifactDownload(models.Model):
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.CharField(max_length=500, blank=True)
 
-    downloaded_at = models.DateTimeField(auto_now_add=True)
+    # Set when the download is queued, not when the audit row is flushed
+    downloaded_at = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         ordering = ['-downloaded_at']
+        indexes = [
+            models.Index(fields=['artifact', '-downloaded_at']),
+            models.Index(fields=['-downloaded_at']),
+        ]
 
     def __str__(self):
         return f"{self.artifact.name} downloaded at {self.downloaded_at}"
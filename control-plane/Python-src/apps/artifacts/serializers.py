@@ -3,12 +3,13 @@ Artifact API serializers
 """
 from rest_framework import serializers
 from apps.artifacts.models import Artifact
+from apps.core.serializers import CachedFieldsSerializerMixin
 
 
-class ArtifactSerializer(serializers.ModelSerializer):
+class ArtifactSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for Artifact model."""
     size_mb = serializers.FloatField(read_only=True)
-    is_expired = serializers.BooleanField(read_only=True)
+    is_expired = serializers.BooleanField(source='is_expired_db', read_only=True)
     execution_number = serializers.IntegerField(source='execution.number', read_only=True)
     job_name = serializers.CharField(source='job.name', read_only=True)
 
@@ -3,11 +3,17 @@ Artifact API views
 """
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
+from django.db.models import BooleanField, ExpressionWrapper, Q
 from django.http import FileResponse
+from django.utils import timezone
 
-from apps.artifacts.models import Artifact, ArtifactDownload
+from apps.artifacts.audit import download_buffer
+from apps.artifacts.models import Artifact
 from apps.artifacts.serializers import ArtifactSerializer
+from apps.core.renderers import ORJSONRenderer
 
 
 class ArtifactViewSet(viewsets.ReadOnlyModelViewSet):
@@ -19,9 +25,26 @@ class ArtifactViewSet(viewsets.ReadOnlyModelViewSet):
     download: Download an artifact
     """
     serializer_class = ArtifactSerializer
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
     lookup_field = 'id'
 
+    # Columns needed by ArtifactSerializer and the tenant permission check
+    queryset_fields = (
+        'id', 'tenant', 'name',
+        'execution', 'execution__number', 'job', 'job__name',
+        'storage_path', 'size_bytes', 'checksum_sha256', 'file_count',
+        'is_compressed', 'compression_type',
+        'retention_days', 'expires_at', 'created_at',
+    )
+
+    # Columns needed by the download action
+    download_fields = (
+        'id', 'tenant', 'name', 'storage_path', 'size_bytes',
+        'checksum_sha256', 'expires_at', 'source_mtime', 'last_verified_at',
+    )
+
     def get_queryset(self):
+        now = timezone.now()
         queryset = Artifact.objects.filter(tenant=self.request.tenant)
 
         # Filter by execution
@@ -37,10 +60,73 @@ class ArtifactViewSet(viewsets.ReadOnlyModelViewSet):
         # Exclude expired by default
         include_expired = self.request.query_params.get('include_expired', 'false')
         if include_expired.lower() != 'true':
-            from django.utils import timezone
-            queryset = queryset.filter(expires_at__gt=timezone.now())
+            queryset = queryset.filter(expires_at__gt=now)
+
+        # Evaluate expiry in SQL against a single timestamp per request
+        queryset = queryset.annotate(
+            is_expired_db=ExpressionWrapper(
+                Q(expires_at__lte=now), output_field=BooleanField()
+            )
+        )
+
+        return queryset.select_related('execution', 'job').only(*self.queryset_fields)
+
+    def list(self, request, *args, **kwargs):
+        """
+        List artifacts.
 
-        return queryset.select_related('execution', 'job')
+        Rows are projected with values() and shaped like ArtifactSerializer
+        output directly, skipping per-field serializer overhead.
+        """
+        queryset = self.filter_queryset(self.get_queryset()).values(
+            'id', 'name', 'execution_id', 'execution__number',
+            'job_id', 'job__name', 'storage_path', 'size_bytes',
+            'checksum_sha256', 'file_count', 'is_compressed', 'compression_type',
+            'retention_days', 'expires_at', 'is_expired_db', 'created_at',
+        )
+
+        page = self.paginate_queryset(queryset)
+        rows = page if page is not None else queryset
+        data = [
+            {
+                'id': row['id'],
+                'name': row['name'],
+                'execution': row['execution_id'],
+                'execution_number': row['execution__number'],
+                'job': row['job_id'],
+                'job_name': row['job__name'],
+                'storage_path': row['storage_path'],
+                'size_bytes': row['size_bytes'],
+                'size_mb': row['size_bytes'] / (1024 * 1024),
+                'checksum_sha256': row['checksum_sha256'],
+                'file_count': row['file_count'],
+                'is_compressed': row['is_compressed'],
+                'compression_type': row['compression_type'],
+                'retention_days': row['retention_days'],
+                'expires_at': row['expires_at'],
+                'is_expired': row['is_expired_db'],
+                'created_at': row['created_at'],
+            }
+            for row in rows
+        ]
+
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def get_object(self):
+        if self.action != 'download':
+            return super().get_object()
+
+        # Single narrow SELECT; expired artifacts are fetched so download
+        # can answer 410 rather than 404
+        artifact = get_object_or_404(
+            Artifact.objects.only(*self.download_fields),
+            id=self.kwargs[self.lookup_field],
+            tenant_id=self.request.tenant.id,
+        )
+        self.check_object_permissions(self.request, artifact)
+        return artifact
 
     @action(detail=True, methods=['get'])
     def download(self, request, id=None):
@@ -53,12 +139,20 @@ class ArtifactViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_410_GONE
             )
 
-        # Record download
-        ArtifactDownload.objects.create(
-            artifact=artifact,
-            downloaded_by=request.user if request.user.is_authenticated else None,
-            ip_address=request.META.get('REMOTE_ADDR'),
-            user_agent=request.META.get('HTTP_USER_AGENT', '')[:500],
+        # Only re-hashes the file when it changed since the last check
+        if not artifact.verify_checksum():
+            return Response(
+                {'error': 'Artifact failed integrity check'},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        # Record download (written in the background)
+        download_buffer.enqueue(
+            artifact_id=artifact.id,
+            user_id=request.user.id if request.user.is_authenticated else None,
+            ip=request.META.get('REMOTE_ADDR'),
+            ua=request.META.get('HTTP_USER_AGENT'),
+            ts=timezone.now(),
         )
 
         # TODO: Implement actual file serving based on storage backend
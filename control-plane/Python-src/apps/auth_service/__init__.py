@@ -1,7 +1,5 @@
-from django.apps import AppConfig
+"""
+Authentication application for Muelsyse-CI
 
-
-class AuthServiceConfig(AppConfig):
-    default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.auth_service'
-    verbose_name = 'Authentication'
+This module handles users, API keys and request authentication.
+"""
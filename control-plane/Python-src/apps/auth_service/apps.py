@@ -0,0 +1,15 @@
+"""
+Auth service Django app configuration
+"""
+from django.apps import AppConfig
+
+
+class AuthServiceConfig(AppConfig):
+    """Configuration for the authentication application."""
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.auth_service'
+    verbose_name = 'Authentication'
+
+    def ready(self):
+        # Register cache invalidation handlers
+        from apps.auth_service import signals  # noqa: F401
@@ -1,9 +1,9 @@
 """
 Custom authentication backends for Muelsyse-CI
 """
-import hashlib
 from rest_framework import authentication, exceptions
-from django.utils import timezone
+
+from apps.auth_service.lookup import resolve_request_api_key
 
 
 class APIKeyAuthentication(authentication.BaseAuthentication):
@@ -21,43 +21,19 @@ class APIKeyAuthentication(authentication.BaseAuthentication):
         if not api_key:
             return None
 
-        # Validate and get API key object
-        key_obj = self._validate_api_key(api_key)
-        if not key_obj:
+        resolution = resolve_request_api_key(request, api_key)
+        if resolution is None:
             raise exceptions.AuthenticationFailed('Invalid API key.')
+        user, tenant, key_obj = resolution
 
         # Record usage
         key_obj.record_usage()
 
         # Set tenant on request
-        request.tenant = key_obj.tenant
+        request.tenant = tenant
         request.api_key = key_obj
 
-        return (key_obj.user, key_obj)
-
-    def _validate_api_key(self, raw_key: str):
-        """Validate API key and return APIKey object if valid."""
-        from apps.auth_service.models import APIKey
-
-        # Check format
-        if not raw_key.startswith('mci_'):
-            return None
-
-        # Hash the key
-        key_hash = hashlib.sha256(raw_key.encode()).hexdigest()
-
-        try:
-            api_key = APIKey.objects.select_related('user', 'tenant').get(
-                key_hash=key_hash
-            )
-        except APIKey.DoesNotExist:
-            return None
-
-        # Check validity
-        if not api_key.is_valid:
-            return None
-
-        return api_key
+        return (user, key_obj)
 
     def authenticate_header(self, request):
         return self.keyword
@@ -0,0 +1,84 @@
+"""
+API key resolution shared by TenantMiddleware and APIKeyAuthentication
+"""
+import hashlib
+
+from django.core.cache import cache
+
+# Attribute on the Django HttpRequest holding the per-request resolution
+REQUEST_CACHE_ATTR = '_cached_apikey_resolution'
+
+# APIKey columns kept in the cache, in model field order. The user and
+# tenant are loaded separately, so no credentials end up in the cache.
+CACHED_API_KEY_FIELDS = (
+    'id', 'tenant_id', 'user_id', 'name', 'key_hash', 'key_prefix',
+    'scopes', 'is_active', 'expires_at',
+)
+
+
+def resolve_api_key(raw_key: str):
+    """
+    Resolve a raw API key to (user, tenant, api_key).
+
+    Returns None if the key is malformed, unknown or no longer valid, or if
+    its user is inactive or its tenant gone. The key's columns are cached
+    for API_KEY_CACHE_TIMEOUT seconds (see apps.auth_service.signals for
+    invalidation); the user is read fresh and the tenant comes from
+    Tenant.get_by_id_cached().
+    """
+    from apps.auth_service.models import APIKey, User, API_KEY_CACHE_TIMEOUT
+    from apps.tenants.models import Tenant
+
+    # Check format
+    if not raw_key.startswith('mci_'):
+        return None
+
+    digest = hashlib.sha256(raw_key.encode()).digest()
+
+    cache_key = APIKey.get_cache_key(digest.hex())
+    row = cache.get(cache_key)
+
+    if row is None:
+        row = APIKey.objects.filter(
+            key_hash_bin=digest
+        ).values_list(*CACHED_API_KEY_FIELDS).first()
+        if row is None:
+            return None
+        cache.set(cache_key, row, timeout=API_KEY_CACHE_TIMEOUT)
+
+    # Columns outside the cached set stay deferred
+    api_key = APIKey.from_db(APIKey.objects.db, CACHED_API_KEY_FIELDS, row)
+
+    if not api_key.is_valid:
+        return None
+
+    user = User.objects.filter(pk=api_key.user_id, is_active=True).first()
+    if user is None:
+        return None
+
+    tenant = Tenant.get_by_id_cached(api_key.tenant_id)
+    if tenant is None:
+        return None
+
+    api_key.user = user
+    api_key.tenant = tenant
+    return user, tenant, api_key
+
+
+def resolve_request_api_key(request, raw_key: str):
+    """
+    Resolve an API key once per request.
+
+    Accepts either a Django HttpRequest or a DRF Request; the result is
+    stored on the underlying HttpRequest so the middleware and the DRF
+    authenticator share it.
+    """
+    http_request = getattr(request, '_request', request)
+
+    cached = getattr(http_request, REQUEST_CACHE_ATTR, None)
+    if cached is not None and cached[0] == raw_key:
+        return cached[1]
+
+    resolution = resolve_api_key(raw_key)
+    setattr(http_request, REQUEST_CACHE_ATTR, (raw_key, resolution))
+    return resolution
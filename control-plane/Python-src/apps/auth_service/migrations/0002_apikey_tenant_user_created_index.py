@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 00:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_service', '0001_initial'),
+        ('tenants', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='apikey',
+            index=models.Index(fields=['tenant', 'user', '-created_at'], name='auth_servic_tenant__a7afca_idx'),
+        ),
+    ]
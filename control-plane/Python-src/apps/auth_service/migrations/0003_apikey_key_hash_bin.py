@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-16 01:10
+
+from django.db import migrations, models
+
+
+def backfill_key_hash_bin(apps, schema_editor):
+    APIKey = apps.get_model('auth_service', 'APIKey')
+    for api_key in APIKey.objects.only('id', 'key_hash').iterator():
+        APIKey.objects.filter(pk=api_key.pk).update(
+            key_hash_bin=bytes.fromhex(api_key.key_hash)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_service', '0002_apikey_tenant_user_created_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apikey',
+            name='key_hash_bin',
+            field=models.BinaryField(editable=False, max_length=32, null=True),
+        ),
+        migrations.RunPython(backfill_key_hash_bin, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='apikey',
+            name='key_hash_bin',
+            field=models.BinaryField(editable=False, max_length=32, unique=True),
+        ),
+    ]
@@ -6,7 +6,15 @@ import hashlib
 import secrets
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.core.cache import cache
 from django.utils import timezone
+from django.utils.functional import cached_property
+
+# How long a resolved API key stays in the cache (seconds)
+API_KEY_CACHE_TIMEOUT = 60
+
+# Minimum interval between last_used_at writes for the same key (seconds)
+API_KEY_USAGE_INTERVAL = 60
 
 
 class User(AbstractUser):
@@ -72,7 +80,8 @@ class APIKey(models.Model):
     )
 
     name = models.CharField(max_length=100)
-    key_hash = models.CharField(max_length=128, unique=True)  # SHA-256 hash
+    key_hash = models.CharField(max_length=128, unique=True)  # SHA-256 hash (hex)
+    key_hash_bin = models.BinaryField(max_length=32, unique=True, editable=False)  # SHA-256 digest
     key_prefix = models.CharField(max_length=8)  # First 8 chars for identification
 
     # Permissions
@@ -89,10 +98,18 @@ class APIKey(models.Model):
         ordering = ['-created_at']
         verbose_name = 'API Key'
         verbose_name_plural = 'API Keys'
+        indexes = [
+            models.Index(fields=['tenant', 'user', '-created_at']),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.key_prefix}...)"
 
+    @staticmethod
+    def get_cache_key(key_hash: str) -> str:
+        """Cache key under which a resolved API key is stored."""
+        return f"apikey:{key_hash}"
+
     @classmethod
     def generate_key(cls) -> tuple[str, str]:
         """Generate a new API key and return (raw_key, hash)."""
@@ -100,6 +117,31 @@ class APIKey(models.Model):
         key_hash = hashlib.sha256(raw_key.encode()).hexdigest()
         return raw_key, key_hash
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Snapshot the stored hash (unless deferred) so a rotation can drop
+        # the old key's cache entry
+        instance._loaded_key_hash = instance.__dict__.get('key_hash')
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Lookups go through the binary digest; keep it in sync with key_hash
+        if self.key_hash:
+            self.key_hash_bin = bytes.fromhex(self.key_hash)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'key_hash' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'key_hash_bin'}
+        # scopes may have been reassigned since the set was built
+        self.__dict__.pop('_scope_set', None)
+        super().save(*args, **kwargs)
+
+        # The signal handler only drops the entry for the current hash
+        loaded_key_hash = getattr(self, '_loaded_key_hash', None)
+        if loaded_key_hash and loaded_key_hash != self.key_hash:
+            cache.delete(self.get_cache_key(loaded_key_hash))
+        self._loaded_key_hash = self.key_hash
+
     @property
     def is_expired(self) -> bool:
         if self.expires_at is None:
@@ -111,16 +153,30 @@ class APIKey(models.Model):
         return self.is_active and not self.is_expired
 
     def record_usage(self) -> None:
-        """Record API key usage."""
+        """
+        Record API key usage.
+
+        Usage is recorded at most once per API_KEY_USAGE_INTERVAL per key and
+        handed to the usage tracker, which writes it back in batches.
+        """
+        from apps.auth_service import usage_tracker
+
+        marker = f"{self.get_cache_key(self.key_hash)}:used"
+        if not cache.add(marker, True, timeout=API_KEY_USAGE_INTERVAL):
+            return
+
         self.last_used_at = timezone.now()
-        self.save(update_fields=['last_used_at'])
+        usage_tracker.touch(self.id, self.last_used_at)
+
+    @cached_property
+    def _scope_set(self) -> frozenset:
+        return frozenset(self.scopes or [])
 
     def has_scope(self, scope: str) -> bool:
         """Check if API key has a specific scope."""
-        if '*' in self.scopes:
-            return True
-        if scope in self.scopes:
+        scopes = self._scope_set
+        if '*' in scopes or scope in scopes:
             return True
         # Check wildcard patterns (e.g., 'pipeline:*')
-        resource = scope.split(':')[0]
-        return f"{resource}:*" in self.scopes
+        resource = scope.split(':', 1)[0]
+        return f"{resource}:*" in scopes
@@ -0,0 +1,15 @@
+"""
+Signal handlers for the auth service.
+"""
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.auth_service.models import APIKey
+
+
+@receiver(post_save, sender=APIKey)
+@receiver(post_delete, sender=APIKey)
+def invalidate_api_key_cache(sender, instance, **kwargs):
+    """Drop the cached API key so changes take effect immediately."""
+    cache.delete(APIKey.get_cache_key(instance.key_hash))
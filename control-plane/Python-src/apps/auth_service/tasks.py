@@ -0,0 +1,18 @@
+"""
+Celery tasks for the auth service
+"""
+import logging
+
+from celery import shared_task
+from rest_framework_simplejwt.tokens import RefreshToken
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def blacklist_refresh_token(refresh_token: str) -> None:
+    """Blacklist a refresh token after logout."""
+    try:
+        RefreshToken(refresh_token).blacklist()
+    except Exception:
+        logger.warning("Failed to blacklist refresh token", exc_info=True)
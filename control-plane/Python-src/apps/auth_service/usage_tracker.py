@@ -0,0 +1,92 @@
+"""
+Batched API key usage tracking for Muelsyse-CI
+
+Authenticated requests record API key usage here instead of issuing an
+UPDATE each. Entries are buffered per process and written back with a
+single UPDATE per flush.
+"""
+import atexit
+import logging
+import threading
+from collections import deque
+
+from django.db import connection
+from django.db.models import Case, DateTimeField, Value, When
+
+logger = logging.getLogger(__name__)
+
+# Seconds between background flushes
+FLUSH_INTERVAL = 10
+
+_pending = deque()
+_lock = threading.Lock()
+_timer = None
+
+
+def touch(key_id, timestamp) -> None:
+    """Record that an API key was used at the given time."""
+    _pending.append((key_id, timestamp))
+    if _timer is None:
+        _schedule_flush()
+
+
+def flush() -> int:
+    """
+    Write buffered usage to the database.
+
+    Returns:
+        Number of API keys updated
+    """
+    from apps.auth_service.models import APIKey
+
+    latest = {}
+    while True:
+        try:
+            key_id, timestamp = _pending.popleft()
+        except IndexError:
+            break
+        if key_id not in latest or timestamp > latest[key_id]:
+            latest[key_id] = timestamp
+
+    if not latest:
+        return 0
+
+    APIKey.objects.filter(id__in=latest.keys()).update(
+        last_used_at=Case(
+            *[When(id=key_id, then=Value(ts)) for key_id, ts in latest.items()],
+            output_field=DateTimeField(),
+        )
+    )
+    return len(latest)
+
+
+def _schedule_flush() -> None:
+    global _timer
+    with _lock:
+        if _timer is None:
+            _timer = threading.Timer(FLUSH_INTERVAL, _run_flush)
+            _timer.daemon = True
+            _timer.start()
+
+
+def _run_flush() -> None:
+    global _timer
+    with _lock:
+        _timer = None
+    try:
+        flush()
+    except Exception:
+        logger.exception("Failed to flush API key usage")
+    finally:
+        # The timer thread owns its own connection
+        connection.close()
+
+
+def _flush_at_exit() -> None:
+    try:
+        flush()
+    except Exception:
+        logger.exception("Failed to flush API key usage on shutdown")
+
+
+atexit.register(_flush_at_exit)
@@ -1,14 +1,23 @@
 """
 Authentication API views
 """
+import logging
+
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
+from django.core.cache import cache
 
 from apps.auth_service.models import User, APIKey
+from apps.auth_service.tasks import blacklist_refresh_token
+
+logger = logging.getLogger(__name__)
+
+# How long the /auth/me payload is cached (seconds)
+ME_CACHE_TIMEOUT = 30
 
 
 class AuthViewSet(viewsets.ViewSet):
@@ -46,24 +55,29 @@ class AuthViewSet(viewsets.ViewSet):
             'access': str(refresh.access_token),
             'refresh': str(refresh),
             'user': {
-                'id': str(user.id),
+                'id': user.id,
                 'username': user.username,
                 'email': user.email,
                 'role': user.role,
-                'tenant_id': str(user.tenant_id) if user.tenant else None,
+                'tenant_id': user.tenant_id,
             }
         })
 
     @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated])
     def logout(self, request):
         """Logout and invalidate refresh token."""
-        try:
-            refresh_token = request.data.get('refresh')
-            if refresh_token:
-                token = RefreshToken(refresh_token)
-                token.blacklist()
-        except Exception:
-            pass
+        refresh_token = request.data.get('refresh')
+        if refresh_token:
+            # Blacklisting writes two rows; do it off the request path
+            try:
+                blacklist_refresh_token.delay(refresh_token)
+            except Exception:
+                # Logout stays best-effort when the broker is unreachable
+                logger.warning(
+                    "Failed to queue refresh token blacklisting; running it inline",
+                    exc_info=True
+                )
+                blacklist_refresh_token(refresh_token)
 
         return Response({'message': 'Logged out successfully'})
 
@@ -93,14 +107,22 @@ class AuthViewSet(viewsets.ViewSet):
     def me(self, request):
         """Get current user info."""
         user = request.user
-        return Response({
-            'id': str(user.id),
-            'username': user.username,
-            'email': user.email,
-            'role': user.role,
-            'tenant_id': str(user.tenant_id) if user.tenant else None,
-            'tenant_name': user.tenant.name if user.tenant else None,
-        })
+
+        # Versioned by updated_at, so saving the user invalidates the entry
+        cache_key = f"user:me:{user.id}:v{user.updated_at.timestamp()}"
+        payload = cache.get(cache_key)
+        if payload is None:
+            payload = {
+                'id': user.id,
+                'username': user.username,
+                'email': user.email,
+                'role': user.role,
+                'tenant_id': user.tenant_id,
+                'tenant_name': user.tenant.name if user.tenant_id else None,
+            }
+            cache.set(cache_key, payload, timeout=ME_CACHE_TIMEOUT)
+
+        return Response(payload)
 
 
 class APIKeyViewSet(viewsets.ModelViewSet):
@@ -114,20 +136,14 @@ class APIKeyViewSet(viewsets.ModelViewSet):
 
     def list(self, request):
         """List user's API keys."""
-        api_keys = self.get_queryset()
-        return Response([
-            {
-                'id': str(key.id),
-                'name': key.name,
-                'key_prefix': key.key_prefix,
-                'scopes': key.scopes,
-                'is_active': key.is_active,
-                'expires_at': key.expires_at,
-                'last_used_at': key.last_used_at,
-                'created_at': key.created_at,
-            }
-            for key in api_keys
-        ])
+        api_keys = self.get_queryset().values(
+            'id', 'name', 'key_prefix', 'scopes', 'is_active',
+            'expires_at', 'last_used_at', 'created_at',
+        )
+        page = self.paginate_queryset(api_keys)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(list(api_keys))
 
     def create(self, request):
         """Create a new API key."""
@@ -1,26 +1,27 @@
 """
-Thread-local context for tenant isolation.
+Context-local storage for tenant isolation.
+
+Uses a ContextVar so the current tenant is isolated per request under both
+WSGI (threads) and ASGI (coroutines sharing a thread).
 """
-import threading
-from typing import Optional
+from contextvars import ContextVar, Token
 
-_thread_locals = threading.local()
+_current_tenant: ContextVar = ContextVar('tenant', default=None)
 
 
-def set_current_tenant(tenant) -> None:
-    """Set the current tenant in thread-local storage."""
-    _thread_locals.tenant = tenant
+def set_current_tenant(tenant) -> Token:
+    """Set the current tenant and return a token for resetting it."""
+    return _current_tenant.set(tenant)
 
 
 def get_current_tenant():
-    """Get the current tenant from thread-local storage."""
-    return getattr(_thread_locals, 'tenant', None)
+    """Get the current tenant."""
+    return _current_tenant.get()
 
 
 def clear_current_tenant() -> None:
-    """Clear the current tenant from thread-local storage."""
-    if hasattr(_thread_locals, 'tenant'):
-        del _thread_locals.tenant
+    """Clear the current tenant."""
+    _current_tenant.set(None)
 
 
 class TenantContext:
@@ -28,16 +29,12 @@ class TenantContext:
 
     def __init__(self, tenant):
         self.tenant = tenant
-        self.previous_tenant = None
+        self._token = None
 
     def __enter__(self):
-        self.previous_tenant = get_current_tenant()
-        set_current_tenant(self.tenant)
+        self._token = set_current_tenant(self.tenant)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.previous_tenant:
-            set_current_tenant(self.previous_tenant)
-        else:
-            clear_current_tenant()
+        _current_tenant.reset(self._token)
         return False
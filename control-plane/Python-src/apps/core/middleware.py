@@ -35,10 +35,10 @@ class TenantMiddleware:
 
     def _identify_tenant(self, request: HttpRequest) -> None:
         """Identify and set the current tenant."""
-        tenant = None
+        tenant = getattr(request, 'tenant', None)
 
         # 1. Try to get tenant from authenticated user
-        if hasattr(request, 'user') and request.user.is_authenticated:
+        if not tenant and hasattr(request, 'user') and request.user.is_authenticated:
             if hasattr(request.user, 'tenant'):
                 tenant = request.user.tenant
 
@@ -46,7 +46,7 @@ class TenantMiddleware:
         if not tenant:
             api_key = request.headers.get('X-API-Key')
             if api_key:
-                tenant = self._get_tenant_from_api_key(api_key)
+                tenant = self._get_tenant_from_api_key(request, api_key)
 
         # 3. Try to get tenant from subdomain
         if not tenant:
@@ -58,20 +58,14 @@ class TenantMiddleware:
         else:
             request.tenant = None
 
-    def _get_tenant_from_api_key(self, api_key: str):
-        """Get tenant from API key."""
-        from apps.auth_service.models import APIKey
-        import hashlib
+    def _get_tenant_from_api_key(self, request: HttpRequest, api_key: str):
+        """Get tenant from API key (shared with APIKeyAuthentication)."""
+        from apps.auth_service.lookup import resolve_request_api_key
 
-        key_hash = hashlib.sha256(api_key.encode()).hexdigest()
-        try:
-            api_key_obj = APIKey.objects.select_related('tenant').get(
-                key_hash=key_hash,
-                is_active=True,
-            )
-            return api_key_obj.tenant
-        except APIKey.DoesNotExist:
+        resolution = resolve_request_api_key(request, api_key)
+        if resolution is None:
             return None
+        return resolution[1]
 
     def _get_tenant_from_subdomain(self, request: HttpRequest):
         """Get tenant from subdomain (SaaS mode)."""
@@ -84,10 +78,9 @@ class TenantMiddleware:
             subdomain = parts[0]
             # Skip common subdomains
             if subdomain not in ('www', 'api', 'app', 'admin'):
-                try:
-                    return Tenant.objects.get(slug=subdomain, is_active=True)
-                except Tenant.DoesNotExist:
-                    pass
+                tenant = Tenant.get_by_slug_cached(subdomain)
+                if tenant is not None and tenant.is_active:
+                    return tenant
 
         return None
 
@@ -96,8 +89,6 @@ class TenantMiddleware:
         from apps.tenants.models import Tenant
 
         slug = getattr(settings, 'DEFAULT_TENANT_SLUG', 'default')
-        try:
-            tenant = Tenant.objects.get(slug=slug)
+        tenant = Tenant.get_by_slug_cached(slug)
+        if tenant is not None:
             set_current_tenant(tenant)
-        except Tenant.DoesNotExist:
-            pass
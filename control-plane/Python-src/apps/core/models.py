@@ -43,11 +43,17 @@ class TenantAwareManager(models.Manager):
     """
     Custom manager that automatically filters by current tenant.
     """
+    _has_tenant = False
+
+    def contribute_to_class(self, cls, name):
+        super().contribute_to_class(cls, name)
+        # Resolved once per model instead of on every queryset
+        self._has_tenant = hasattr(cls, 'tenant')
 
     def get_queryset(self):
         from apps.core.context import get_current_tenant
         queryset = super().get_queryset()
         tenant = get_current_tenant()
-        if tenant and hasattr(self.model, 'tenant'):
-            queryset = queryset.filter(tenant=tenant)
+        if tenant and self._has_tenant:
+            queryset = queryset.filter(tenant_id=tenant.id)
         return queryset
@@ -1,6 +1,9 @@
 """
 Custom permissions for Muelsyse-CI
 """
+from functools import reduce
+from operator import or_
+
 from rest_framework import permissions
 
 
@@ -12,13 +15,16 @@ class TenantPermission(permissions.BasePermission):
 
     def has_permission(self, request, view):
         # Allow if tenant is set (authenticated and identified)
-        return hasattr(request, 'tenant') and request.tenant is not None
+        tenant = getattr(request, 'tenant', None)
+        request._tenant_id = tenant.id if tenant is not None else None
+        return tenant is not None
 
     def has_object_permission(self, request, view, obj):
-        # Check if object belongs to user's tenant
-        if hasattr(obj, 'tenant'):
-            return obj.tenant == request.tenant
-        return True
+        # Check if object belongs to user's tenant. Compare the FK column so
+        # the tenant row is not fetched just for the check; objects without
+        # a tenant column are allowed.
+        tenant_id = request._tenant_id
+        return getattr(obj, 'tenant_id', tenant_id) == tenant_id
 
 
 class RolePermission(permissions.BasePermission):
@@ -33,25 +39,25 @@ class RolePermission(permissions.BasePermission):
     """
 
     ROLE_PERMISSIONS = {
-        'owner': ['*'],
-        'admin': [
+        'owner': frozenset({'*'}),
+        'admin': frozenset({
             'pipeline:read', 'pipeline:write', 'pipeline:delete',
             'runner:read', 'runner:write', 'runner:delete',
             'secret:read', 'secret:write', 'secret:delete',
             'execution:read', 'execution:write',
             'user:read',
-        ],
-        'developer': [
+        }),
+        'developer': frozenset({
             'pipeline:read', 'pipeline:write',
             'execution:read', 'execution:write',
             'secret:read',
             'artifact:read', 'artifact:write',
-        ],
-        'viewer': [
+        }),
+        'viewer': frozenset({
             'pipeline:read',
             'execution:read',
             'artifact:read',
-        ],
+        }),
     }
 
     def has_permission(self, request, view):
@@ -62,14 +68,35 @@ class RolePermission(permissions.BasePermission):
         if not request.user.is_authenticated:
             return False
 
-        user_role = getattr(request.user, 'role', 'viewer')
-        user_permissions = self.ROLE_PERMISSIONS.get(user_role, [])
-
-        # Check wildcard permission
-        if '*' in user_permissions:
-            return True
-
-        return required_permission in user_permissions
+        # Resolved once per request
+        mask = getattr(request, '_perm_mask', None)
+        if mask is None:
+            user_role = getattr(request.user, 'role', 'viewer')
+            mask = _ROLE_MASKS.get(user_role, 0)
+            request._perm_mask = mask
+
+        bit = _PERMISSION_BITS.get(required_permission)
+        if bit is None:
+            # Only the wildcard role grants permissions no role lists
+            return mask == _ALL_PERMISSIONS
+        return bool(mask & bit)
+
+
+# Each named permission gets one bit; roles are the OR of their bits and
+# the '*' wildcard sets every bit.
+_PERMISSION_BITS = {
+    name: 1 << i
+    for i, name in enumerate(sorted(
+        set().union(*RolePermission.ROLE_PERMISSIONS.values()) - {'*'}
+    ))
+}
+_ALL_PERMISSIONS = -1
+_ROLE_MASKS = {
+    role: _ALL_PERMISSIONS if '*' in perms else reduce(
+        or_, (_PERMISSION_BITS[p] for p in perms), 0
+    )
+    for role, perms in RolePermission.ROLE_PERMISSIONS.items()
+}
 
 
 class IsOwnerOrAdmin(permissions.BasePermission):
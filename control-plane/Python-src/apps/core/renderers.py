@@ -0,0 +1,34 @@
+"""
+Custom renderers for Muelsyse-CI API
+"""
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_fallback_encoder = JSONEncoder()
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    JSON renderer backed by orjson.
+
+    UUIDs, datetimes and dataclasses are encoded natively; anything else
+    (Decimal, lazy translation strings, querysets) goes through DRF's
+    JSONEncoder so output matches the default renderer.
+    """
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    options = orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        options = self.options
+        renderer_context = renderer_context or {}
+        if renderer_context.get('indent'):
+            options |= orjson.OPT_INDENT_2
+
+        return orjson.dumps(data, default=_fallback_encoder.default, option=options)
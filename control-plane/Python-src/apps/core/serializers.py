@@ -0,0 +1,33 @@
+"""
+Shared serializer helpers for Muelsyse-CI
+"""
+import copy
+
+from rest_framework.serializers import BaseSerializer
+
+# Unbound fields per serializer class, built on first use
+_FIELD_CACHE: dict[type, dict] = {}
+
+
+class CachedFieldsSerializerMixin:
+    """
+    Serializer mixin that builds the field map once per class.
+
+    ModelSerializer.get_fields() introspects the model and constructs every
+    field on each instantiation, which dominates list endpoints. The unbound
+    fields only depend on the class, so they are cached and each instance
+    gets its own copies to bind.
+    """
+
+    def get_fields(self):
+        cls = type(self)
+        fields = _FIELD_CACHE.get(cls)
+        if fields is None:
+            fields = _FIELD_CACHE[cls] = super().get_fields()
+
+        # Nested serializers mutate their children when bound, so only
+        # those need a deep copy
+        return {
+            name: copy.deepcopy(field) if isinstance(field, BaseSerializer) else copy.copy(field)
+            for name, field in fields.items()
+        }
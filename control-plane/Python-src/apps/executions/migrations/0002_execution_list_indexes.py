@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-16 00:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('executions', '0001_initial'),
+        ('pipelines', '0001_initial'),
+        ('tenants', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='execution',
+            name='executions__tenant__8303bd_idx',
+        ),
+        migrations.AddIndex(
+            model_name='execution',
+            index=models.Index(fields=['tenant', 'status', '-created_at'], name='executions__tenant__82b2b1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='execution',
+            index=models.Index(fields=['tenant', 'pipeline', '-created_at'], name='executions__tenant__e1919c_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 00:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('executions', '0002_execution_list_indexes'),
+        ('runners', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['execution', 'job_key'], name='executions__executi_cfbe07_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-16 00:53
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+
+
+def backfill_log_chunk_count(apps, schema_editor):
+    Step = apps.get_model('executions', 'Step')
+    LogChunk = apps.get_model('logs', 'LogChunk')
+    counts = LogChunk.objects.filter(
+        step_id=OuterRef('pk')
+    ).order_by().values('step_id').annotate(n=Count('id')).values('n')
+    Step.objects.filter(
+        id__in=LogChunk.objects.values('step_id')
+    ).update(log_chunk_count=Subquery(counts[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('executions', '0003_job_execution_job_key_index'),
+        ('logs', '0002_logchunk_job_step_order'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='step',
+            name='log_chunk_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_log_chunk_count, migrations.RunPython.noop),
+    ]
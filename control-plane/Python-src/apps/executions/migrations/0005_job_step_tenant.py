@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-16 01:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_tenant(apps, schema_editor):
+    Execution = apps.get_model('executions', 'Execution')
+    Job = apps.get_model('executions', 'Job')
+    Step = apps.get_model('executions', 'Step')
+    Job.objects.update(tenant_id=Subquery(
+        Execution.objects.filter(pk=OuterRef('execution_id')).values('tenant_id')[:1]
+    ))
+    Step.objects.update(tenant_id=Subquery(
+        Job.objects.filter(pk=OuterRef('job_id')).values('tenant_id')[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('executions', '0004_step_log_chunk_count'),
+        ('tenants', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='tenant',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='jobs', to='tenants.tenant'),
+        ),
+        migrations.AddField(
+            model_name='step',
+            name='tenant',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='steps', to='tenants.tenant'),
+        ),
+        migrations.RunPython(backfill_tenant, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='job',
+            name='tenant',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='jobs', to='tenants.tenant'),
+        ),
+        migrations.AlterField(
+            model_name='step',
+            name='tenant',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='steps', to='tenants.tenant'),
+        ),
+    ]
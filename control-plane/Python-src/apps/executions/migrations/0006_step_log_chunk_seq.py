@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-16 01:27
+
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+
+
+def backfill_log_chunk_seq(apps, schema_editor):
+    Step = apps.get_model('executions', 'Step')
+    LogChunk = apps.get_model('logs', 'LogChunk')
+    next_chunk = LogChunk.objects.filter(
+        step_id=OuterRef('pk')
+    ).order_by().values('step_id').annotate(n=Max('chunk_number') + 1).values('n')
+    Step.objects.filter(
+        id__in=LogChunk.objects.values('step_id')
+    ).update(log_chunk_seq=Subquery(next_chunk[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('executions', '0005_job_step_tenant'),
+        ('logs', '0002_logchunk_job_step_order'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='step',
+            name='log_chunk_seq',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_log_chunk_seq, migrations.RunPython.noop),
+    ]
@@ -4,10 +4,25 @@ Execution models for Muelsyse-CI
 This module contains models for tracking pipeline executions, jobs, and steps.
 """
 import uuid
-from django.db import models
+from django.db import connection, models
+from django.db.models.functions import Cast, Extract
+from django.utils import timezone
 from apps.core.models import TenantAwareModel
 
 
+class DurationQuerySet(models.QuerySet):
+    """QuerySet for models with started_at/finished_at timestamps."""
+
+    def with_duration(self):
+        """Annotate db_duration_seconds, computed by the database."""
+        return self.annotate(
+            db_duration_seconds=Cast(
+                Extract(models.F('finished_at') - models.F('started_at'), 'epoch'),
+                models.FloatField(),
+            )
+        )
+
+
 class Execution(TenantAwareModel):
     """
     Pipeline execution record.
@@ -94,11 +109,15 @@ class Execution(TenantAwareModel):
         related_name='triggered_executions'
     )
 
+    objects = DurationQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
         unique_together = ['pipeline', 'number']
         indexes = [
-            models.Index(fields=['tenant', 'status']),
+            # Cover the list filters together with the default ordering
+            models.Index(fields=['tenant', 'status', '-created_at']),
+            models.Index(fields=['tenant', 'pipeline', '-created_at']),
             models.Index(fields=['pipeline', '-number']),
             models.Index(fields=['status', 'queued_at']),
         ]
@@ -109,17 +128,57 @@ class Execution(TenantAwareModel):
     @property
     def duration_seconds(self) -> float | None:
         """Calculate execution duration in seconds."""
+        if 'db_duration_seconds' in self.__dict__:
+            return self.db_duration_seconds
         if self.started_at and self.finished_at:
             return (self.finished_at - self.started_at).total_seconds()
         return None
 
     def get_next_number(self) -> int:
         """Get the next execution number for this pipeline."""
-        last = Execution.objects.filter(
-            pipeline=self.pipeline
-        ).order_by('-number').values_list('number', flat=True).first()
+        from apps.pipelines.models import Pipeline
+
+        last = Pipeline.objects.filter(
+            pk=self.pipeline_id
+        ).values_list('last_execution_number', flat=True).first()
         return (last or 0) + 1
 
+    @classmethod
+    def allocate_number(cls, pipeline_id) -> int:
+        """
+        Reserve the next execution number for a pipeline.
+
+        Bumps Pipeline.last_execution_number and stamps last_execution_at in
+        a single UPDATE, whose row lock serializes concurrent triggers; call
+        inside transaction.atomic() together with the INSERT that uses it.
+        On PostgreSQL the new number comes back via RETURNING.
+        """
+        from apps.pipelines.models import Pipeline
+
+        now = timezone.now()
+
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'UPDATE {Pipeline._meta.db_table} '
+                    f'SET last_execution_number = last_execution_number + 1, '
+                    f'last_execution_at = %s '
+                    f'WHERE id = %s::uuid RETURNING last_execution_number',
+                    [now, pipeline_id],
+                )
+                row = cursor.fetchone()
+            if row is None:
+                raise Pipeline.DoesNotExist
+            return row[0]
+
+        Pipeline.objects.filter(pk=pipeline_id).update(
+            last_execution_number=models.F('last_execution_number') + 1,
+            last_execution_at=now,
+        )
+        return Pipeline.objects.filter(
+            pk=pipeline_id
+        ).values_list('last_execution_number', flat=True).get()
+
 
 class Job(models.Model):
     """
@@ -145,6 +204,14 @@ class Job(models.Model):
         on_delete=models.CASCADE,
         related_name='jobs'
     )
+    # Copied from the execution so tenant scoping needs no joins
+    tenant = models.ForeignKey(
+        'tenants.Tenant',
+        on_delete=models.CASCADE,
+        related_name='jobs',
+        db_index=True,
+        editable=False,
+    )
 
     # Job identification
     name = models.CharField(max_length=200)
@@ -225,19 +292,29 @@ class Job(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = DurationQuerySet.as_manager()
+
     class Meta:
         ordering = ['created_at']
         indexes = [
             models.Index(fields=['execution', 'status']),
+            models.Index(fields=['execution', 'job_key']),
             models.Index(fields=['runner', 'status']),
         ]
 
     def __str__(self):
         return f"{self.execution} / {self.name}"
 
+    def save(self, *args, **kwargs):
+        if self.tenant_id is None:
+            self.tenant_id = self.execution.tenant_id
+        super().save(*args, **kwargs)
+
     @property
     def duration_seconds(self) -> float | None:
         """Calculate job duration in seconds."""
+        if 'db_duration_seconds' in self.__dict__:
+            return self.db_duration_seconds
         if self.started_at and self.finished_at:
             return (self.finished_at - self.started_at).total_seconds()
         return None
@@ -247,16 +324,10 @@ class Job(models.Model):
         if not self.needs:
             return True
 
-        dependent_jobs = Job.objects.filter(
-            execution=self.execution,
+        return not Job.objects.filter(
+            execution_id=self.execution_id,
             job_key__in=self.needs
-        )
-
-        for job in dependent_jobs:
-            if job.status != self.Status.SUCCESS:
-                return False
-
-        return True
+        ).exclude(status=self.Status.SUCCESS).exists()
 
 
 class Step(models.Model):
@@ -285,6 +356,14 @@ class Step(models.Model):
         on_delete=models.CASCADE,
         related_name='steps'
     )
+    # Copied from the job so tenant scoping needs no joins
+    tenant = models.ForeignKey(
+        'tenants.Tenant',
+        on_delete=models.CASCADE,
+        related_name='steps',
+        db_index=True,
+        editable=False,
+    )
 
     # Step identification
     name = models.CharField(max_length=200)
@@ -347,6 +426,14 @@ class Step(models.Model):
         help_text='Step outputs set via ::set-output'
     )
 
+    # Number of stored LogChunk rows, maintained by the log writers
+    log_chunk_count = models.PositiveIntegerField(default=0)
+
+    # Next chunk_number to hand out, see reserve_log_chunks()
+    log_chunk_seq = models.PositiveIntegerField(default=0)
+
+    objects = DurationQuerySet.as_manager()
+
     class Meta:
         ordering = ['order']
         indexes = [
@@ -356,9 +443,63 @@ class Step(models.Model):
     def __str__(self):
         return f"{self.job} / Step {self.order}: {self.name}"
 
+    def save(self, *args, **kwargs):
+        if self.tenant_id is None:
+            self.tenant_id = self.job.tenant_id
+        super().save(*args, **kwargs)
+
     @property
     def duration_seconds(self) -> float | None:
         """Calculate step duration in seconds."""
+        if 'db_duration_seconds' in self.__dict__:
+            return self.db_duration_seconds
         if self.started_at and self.finished_at:
             return (self.finished_at - self.started_at).total_seconds()
         return None
+
+    @classmethod
+    def reserve_log_chunks(cls, counts: dict) -> dict:
+        """
+        Reserve consecutive log chunk numbers for several steps.
+
+        counts maps step ids to how many numbers each needs; the result maps
+        the ids of existing steps to the first number reserved for them.
+        On PostgreSQL this is one UPDATE ... RETURNING; elsewhere the step
+        rows are locked and read before the counters are bumped, so call it
+        inside transaction.atomic().
+        """
+        if not counts:
+            return {}
+
+        if connection.vendor == 'postgresql':
+            table = cls._meta.db_table
+            values = ', '.join(['(%s::uuid, %s)'] * len(counts))
+            params = [value for item in counts.items() for value in item]
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'UPDATE {table} AS s SET log_chunk_seq = s.log_chunk_seq + v.n '
+                    f'FROM (VALUES {values}) AS v(id, n) WHERE s.id = v.id '
+                    f'RETURNING s.id, s.log_chunk_seq, v.n',
+                    params,
+                )
+                return {
+                    str(step_id): seq - n for step_id, seq, n in cursor.fetchall()
+                }
+
+        reserved = {
+            str(step_id): seq
+            for step_id, seq in cls.objects.select_for_update().filter(
+                id__in=counts
+            ).values_list('id', 'log_chunk_seq')
+        }
+        cls.objects.filter(id__in=counts).update(
+            log_chunk_seq=models.Case(
+                *[
+                    models.When(id=step_id, then=models.F('log_chunk_seq') + n)
+                    for step_id, n in counts.items()
+                ],
+                default=models.F('log_chunk_seq'),
+                output_field=models.PositiveIntegerField(),
+            )
+        )
+        return reserved
@@ -43,7 +43,7 @@ class JobSerializer(serializers.ModelSerializer):
 class JobSummarySerializer(serializers.ModelSerializer):
     """Summary serializer for Job (without steps)."""
     duration_seconds = serializers.FloatField(read_only=True)
-    step_count = serializers.SerializerMethodField()
+    step_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Job
@@ -53,9 +53,6 @@ class JobSummarySerializer(serializers.ModelSerializer):
             'step_count'
         ]
 
-    def get_step_count(self, obj):
-        return obj.steps.count()
-
 
 class ExecutionSerializer(serializers.ModelSerializer):
     """Serializer for Execution model."""
@@ -83,7 +80,7 @@ class ExecutionListSerializer(serializers.ModelSerializer):
     """List serializer for Execution (lighter weight)."""
     duration_seconds = serializers.FloatField(read_only=True)
     pipeline_name = serializers.CharField(source='pipeline.name', read_only=True)
-    job_count = serializers.SerializerMethodField()
+    job_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Execution
@@ -93,6 +90,3 @@ class ExecutionListSerializer(serializers.ModelSerializer):
             'started_at', 'finished_at', 'duration_seconds',
             'job_count', 'created_at'
         ]
-
-    def get_job_count(self, obj):
-        return obj.jobs.count()
@@ -1,9 +1,13 @@
 """
 Execution API views
 """
+import orjson
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.db import transaction
+from django.db.models import Count, Prefetch
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 
 from apps.executions.models import Execution, Job, Step
@@ -16,6 +20,10 @@ from apps.executions.serializers import (
 from apps.logs.models import LogChunk
 
 
+# Statuses an execution or job can still be cancelled from
+ACTIVE_STATUSES = ('pending', 'queued', 'running')
+
+
 class ExecutionViewSet(viewsets.ReadOnlyModelViewSet):
     """
     API endpoint for execution management.
@@ -28,6 +36,13 @@ class ExecutionViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = ExecutionSerializer
     lookup_field = 'id'
 
+    # Columns needed by ExecutionListSerializer; skips the JSON payloads
+    list_fields = (
+        'id', 'tenant', 'pipeline', 'pipeline__name',
+        'number', 'trigger_type', 'status',
+        'started_at', 'finished_at', 'created_at',
+    )
+
     def get_queryset(self):
         queryset = Execution.objects.filter(tenant=self.request.tenant)
 
@@ -41,7 +56,22 @@ class ExecutionViewSet(viewsets.ReadOnlyModelViewSet):
         if status_filter:
             queryset = queryset.filter(status=status_filter)
 
-        return queryset.select_related('pipeline', 'triggered_by')
+        # Counts are computed in the same query instead of one per row
+        if self.action == 'list':
+            return queryset.select_related('pipeline').only(
+                *self.list_fields
+            ).annotate(job_count=Count('jobs')).with_duration()
+
+        queryset = queryset.select_related('pipeline', 'triggered_by').with_duration()
+        if self.action == 'retrieve':
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    'jobs',
+                    queryset=Job.objects.annotate(step_count=Count('steps')).with_duration(),
+                )
+            )
+
+        return queryset
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -53,23 +83,28 @@ class ExecutionViewSet(viewsets.ReadOnlyModelViewSet):
         """Cancel a running execution."""
         execution = self.get_object()
 
-        if execution.status not in ['pending', 'queued', 'running']:
+        if execution.status not in ACTIVE_STATUSES:
             return Response(
                 {'error': 'Can only cancel pending, queued, or running executions'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        execution.status = Execution.Status.CANCELLED
-        execution.finished_at = timezone.now()
-        execution.save(update_fields=['status', 'finished_at'])
-
-        # Cancel all pending/running jobs
-        execution.jobs.filter(
-            status__in=['pending', 'queued', 'running']
-        ).update(
-            status=Job.Status.CANCELLED,
-            finished_at=timezone.now()
-        )
+        with transaction.atomic():
+            now = timezone.now()
+            # Guard on status so a concurrent finish is not overwritten
+            cancelled = Execution.objects.filter(
+                pk=execution.pk, status__in=ACTIVE_STATUSES
+            ).update(status=Execution.Status.CANCELLED, finished_at=now)
+            if not cancelled:
+                return Response(
+                    {'error': 'Can only cancel pending, queued, or running executions'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            # Cancel all pending/running jobs
+            Job.objects.filter(
+                execution_id=execution.pk, status__in=ACTIVE_STATUSES
+            ).update(status=Job.Status.CANCELLED, finished_at=now)
 
         return Response({'status': 'cancelled'})
 
@@ -85,21 +120,22 @@ class ExecutionViewSet(viewsets.ReadOnlyModelViewSet):
             )
 
         # Create a new execution
-        new_execution = Execution.objects.create(
-            tenant=execution.tenant,
-            pipeline=execution.pipeline,
-            pipeline_config=execution.pipeline_config,
-            number=Execution.objects.filter(pipeline=execution.pipeline).count() + 1,
-            trigger_type=Execution.TriggerType.MANUAL,
-            trigger_info={
-                'retry_of': str(execution.id),
-                'user_id': str(request.user.id),
-                'username': request.user.username,
-            },
-            inputs=execution.inputs,
-            environment=execution.environment,
-            triggered_by=request.user,
-        )
+        with transaction.atomic():
+            new_execution = Execution.objects.create(
+                tenant_id=execution.tenant_id,
+                pipeline_id=execution.pipeline_id,
+                pipeline_config_id=execution.pipeline_config_id,
+                number=Execution.allocate_number(execution.pipeline_id),
+                trigger_type=Execution.TriggerType.MANUAL,
+                trigger_info={
+                    'retry_of': str(execution.id),
+                    'user_id': str(request.user.id),
+                    'username': request.user.username,
+                },
+                inputs=execution.inputs,
+                environment=execution.environment,
+                triggered_by=request.user,
+            )
 
         # TODO: Queue new execution for processing
 
@@ -112,7 +148,9 @@ class ExecutionViewSet(viewsets.ReadOnlyModelViewSet):
     def jobs(self, request, id=None):
         """Get all jobs for an execution."""
         execution = self.get_object()
-        jobs = execution.jobs.all()
+        jobs = execution.jobs.select_related('runner').with_duration().prefetch_related(
+            Prefetch('steps', queryset=Step.objects.with_duration())
+        )
         serializer = JobSerializer(jobs, many=True)
         return Response(serializer.data)
 
@@ -123,9 +161,16 @@ class JobViewSet(viewsets.ReadOnlyModelViewSet):
     lookup_field = 'id'
 
     def get_queryset(self):
-        return Job.objects.filter(
-            execution__tenant=self.request.tenant
-        ).select_related('execution', 'runner')
+        queryset = Job.objects.filter(
+            tenant_id=self.request.tenant.id
+        ).select_related('execution', 'runner').with_duration()
+
+        if self.action in ('retrieve', 'steps'):
+            queryset = queryset.prefetch_related(
+                Prefetch('steps', queryset=Step.objects.with_duration())
+            )
+
+        return queryset
 
     @action(detail=True, methods=['get'])
     def steps(self, request, id=None):
@@ -143,8 +188,8 @@ class StepViewSet(viewsets.ReadOnlyModelViewSet):
 
     def get_queryset(self):
         return Step.objects.filter(
-            job__execution__tenant=self.request.tenant
-        ).select_related('job')
+            tenant_id=self.request.tenant.id
+        ).select_related('job').with_duration()
 
     @action(detail=True, methods=['get'])
     def logs(self, request, id=None):
@@ -159,7 +204,7 @@ class StepViewSet(viewsets.ReadOnlyModelViewSet):
 
         return Response({
             'step_id': str(step.id),
-            'total_chunks': step.log_chunks.count(),
+            'total_chunks': step.log_chunk_count,
             'logs': [
                 {
                     'chunk_number': log.chunk_number,
@@ -170,3 +215,29 @@ class StepViewSet(viewsets.ReadOnlyModelViewSet):
                 for log in logs
             ]
         })
+
+    @action(detail=True, methods=['get'], url_path='logs/stream')
+    def logs_stream(self, request, id=None):
+        """
+        Stream all logs for a step as NDJSON.
+
+        The first line holds step_id and total_chunks; each following line
+        is one chunk. Rows are read with a cursor, so memory use does not
+        grow with the log size.
+        """
+        step = self.get_object()
+        offset = int(request.query_params.get('offset', 0))
+
+        rows = LogChunk.objects.filter(step=step).order_by('chunk_number').values(
+            'chunk_number', 'content', 'level', 'timestamp'
+        )[offset:]
+
+        def generate():
+            yield orjson.dumps({
+                'step_id': step.id,
+                'total_chunks': step.log_chunk_count,
+            }, option=orjson.OPT_APPEND_NEWLINE)
+            for row in rows.iterator(chunk_size=200):
+                yield orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE)
+
+        return StreamingHttpResponse(generate(), content_type='application/x-ndjson')
@@ -2,6 +2,8 @@
 Log WebSocket consumers for Muelsyse-CI
 """
 import json
+from urllib.parse import parse_qs
+import orjson
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from asgiref.sync import sync_to_async
@@ -20,6 +22,12 @@ class LogConsumer(AsyncWebsocketConsumer):
         self.execution_id = self.scope['url_route']['kwargs']['execution_id']
         self.job_id = self.scope['url_route']['kwargs'].get('job_id')
 
+        query = parse_qs(self.scope.get('query_string', b'').decode())
+        try:
+            self.protocol_version = int(query.get('protocol', ['1'])[0])
+        except ValueError:
+            self.protocol_version = 1
+
         # Determine group name
         if self.job_id:
             self.group_name = f'logs_job_{self.job_id}'
@@ -70,89 +78,141 @@ class LogConsumer(AsyncWebsocketConsumer):
     async def log_message(self, event):
         """
         Receive log message from channel layer and send to WebSocket.
+
+        RunnerConsumer.handle_log always sets every field, so the event is
+        read without defaults. Also used to fan out log_batch entries to
+        clients that have not opted in to ?protocol=2.
         """
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=orjson.dumps({
             'type': 'log',
-            'job_id': event.get('job_id'),
-            'step_id': event.get('step_id'),
-            'timestamp': event.get('timestamp'),
-            'content': event.get('content'),
-            'level': event.get('level', 'info'),
-        }))
+            'job_id': event['job_id'],
+            'step_id': event['step_id'],
+            'timestamp': event['timestamp'],
+            'content': event['content'],
+            'level': event['level'],
+        }).decode())
+
+    async def log_batch(self, event):
+        """
+        Receive a batch of log messages from channel layer.
+
+        Fanned out as one 'log' frame per entry, as for single log
+        messages; clients connecting with ?protocol=2 get one 'log_batch'
+        frame of 'log' entries instead.
+        """
+        entries = event['entries']
+
+        if self.protocol_version >= 2:
+            await self.send(text_data=orjson.dumps({
+                'type': 'log_batch',
+                'logs': entries,
+                'count': len(entries),
+            }).decode())
+            return
+
+        for entry in entries:
+            await self.log_message(entry)
 
     async def status_update(self, event):
         """
         Receive status update from channel layer and send to WebSocket.
         """
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=orjson.dumps({
             'type': 'status_update',
-            'entity_type': event.get('entity_type'),
-            'entity_id': event.get('entity_id'),
-            'status': event.get('status'),
-            'timestamp': event.get('timestamp'),
-        }))
+            'entity_type': event['entity_type'],
+            'entity_id': event['entity_id'],
+            'status': event['status'],
+            'timestamp': event['timestamp'],
+        }).decode())
 
     @database_sync_to_async
     def has_permission(self):
-        """Check if user has permission to view these logs."""
-        from apps.executions.models import Execution
+        """
+        Check if user has permission to view these logs.
+
+        Runs a single tenant-scoped EXISTS; the user's tenant_id is already
+        loaded on the scope user, so the tenant row is never fetched.
+        """
+        from apps.executions.models import Execution, Job
 
         # Get user from scope
         user = self.scope.get('user')
         if not user or not user.is_authenticated:
             return False
 
-        try:
-            execution = Execution.objects.get(id=self.execution_id)
-            # Check tenant
-            if hasattr(user, 'tenant') and execution.tenant != user.tenant:
-                return False
-            return True
-        except Execution.DoesNotExist:
+        tenant_id = getattr(user, 'tenant_id', None)
+        if tenant_id is None:
             return False
 
+        if self.job_id:
+            # The job must also belong to the execution in the URL
+            return Job.objects.filter(
+                id=self.job_id,
+                execution_id=self.execution_id,
+                tenant_id=tenant_id,
+            ).exists()
+
+        return Execution.objects.filter(
+            id=self.execution_id,
+            tenant_id=tenant_id,
+        ).exists()
+
     @database_sync_to_async
     def get_existing_logs(self):
         """Fetch existing logs from database."""
         from apps.logs.models import LogChunk
-        from apps.executions.models import Step
 
         if self.job_id:
             # Get logs for specific job
-            steps = Step.objects.filter(job_id=self.job_id)
+            logs = LogChunk.objects.filter(job_id=self.job_id)
         else:
             # Get logs for entire execution
             from apps.executions.models import Job
-            job_ids = Job.objects.filter(
-                execution_id=self.execution_id
-            ).values_list('id', flat=True)
-            steps = Step.objects.filter(job_id__in=job_ids)
+            logs = LogChunk.objects.filter(
+                job_id__in=Job.objects.filter(
+                    execution_id=self.execution_id
+                ).values('id')
+            )
 
-        step_ids = list(steps.values_list('id', flat=True))
-        logs = LogChunk.objects.filter(
-            step_id__in=step_ids
-        ).order_by('step__job_id', 'step__order', 'chunk_number')[:1000]
+        rows = logs.order_by('job_id', 'step_order', 'chunk_number').values_list(
+            'job_id', 'step_id', 'timestamp', 'content', 'level'
+        )[:1000]
 
         return [
             {
                 'type': 'log',
-                'job_id': str(log.step.job_id),
-                'step_id': str(log.step_id),
-                'timestamp': log.timestamp.isoformat(),
-                'content': log.content,
-                'level': log.level,
+                'job_id': str(job_id),
+                'step_id': str(step_id),
+                'timestamp': timestamp.isoformat(),
+                'content': content,
+                'level': level,
             }
-            for log in logs
+            for job_id, step_id, timestamp, content, level in rows.iterator(chunk_size=200)
         ]
 
     async def send_history(self):
-        """Send existing logs to newly connected client."""
+        """
+        Send existing logs to newly connected client.
+
+        By default each entry is sent as its own 'log' frame, followed by
+        'history_complete'. Clients connecting with ?protocol=2 get the
+        whole history as one 'history' frame instead.
+        """
         logs = await self.get_existing_logs()
-        for log in logs:
-            await self.send(text_data=json.dumps(log))
 
-        # Send history complete marker
-        await self.send(text_data=json.dumps({
-            'type': 'history_complete',
+        if self.protocol_version < 2:
+            for log in logs:
+                await self.send(text_data=json.dumps(log))
+
+            # Send history complete marker
+            await self.send(text_data=json.dumps({
+                'type': 'history_complete',
+                'count': len(logs),
+            }))
+            return
+
+        await self.send(text_data=orjson.dumps({
+            'type': 'history',
+            'logs': logs,
             'count': len(logs),
-        }))
+        }).decode())
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-16 00:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_job_and_step_order(apps, schema_editor):
+    LogChunk = apps.get_model('logs', 'LogChunk')
+    Step = apps.get_model('executions', 'Step')
+    steps = Step.objects.filter(pk=OuterRef('step_id'))
+    LogChunk.objects.filter(job__isnull=True).update(
+        job_id=Subquery(steps.values('job_id')[:1]),
+        step_order=Subquery(steps.values('order')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('executions', '0002_execution_list_indexes'),
+        ('logs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='logchunk',
+            name='job',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='log_chunks', to='executions.job'),
+        ),
+        migrations.AddField(
+            model_name='logchunk',
+            name='step_order',
+            field=models.PositiveIntegerField(null=True),
+        ),
+        migrations.RunPython(backfill_job_and_step_order, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='logchunk',
+            index=models.Index(fields=['job', 'step_order', 'chunk_number'], name='logs_logchu_job_id_2cf5f0_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-16 02:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logs', '0002_logchunk_job_step_order'),
+    ]
+
+    operations = [
+        # Every chunk was backfilled from its step in 0002
+        migrations.AlterField(
+            model_name='logchunk',
+            name='job',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='log_chunks', to='executions.job'),
+        ),
+        migrations.AlterField(
+            model_name='logchunk',
+            name='step_order',
+            field=models.PositiveIntegerField(),
+        ),
+    ]
@@ -3,7 +3,14 @@ Log models for Muelsyse-CI
 
 This module contains models for storing execution logs.
 """
-from django.db import models
+import logging
+import threading
+from collections import Counter
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Greatest
+
+logger = logging.getLogger(__name__)
 
 
 class LogChunk(models.Model):
@@ -26,6 +33,14 @@ class LogChunk(models.Model):
         related_name='log_chunks'
     )
 
+    # Denormalized from step so history can be ordered without a join
+    job = models.ForeignKey(
+        'executions.Job',
+        on_delete=models.CASCADE,
+        related_name='log_chunks',
+    )
+    step_order = models.PositiveIntegerField()
+
     chunk_number = models.PositiveIntegerField()
     content = models.TextField()
     level = models.CharField(
@@ -41,6 +56,7 @@ class LogChunk(models.Model):
         unique_together = ['step', 'chunk_number']
         indexes = [
             models.Index(fields=['step', 'chunk_number']),
+            models.Index(fields=['job', 'step_order', 'chunk_number']),
         ]
 
     def __str__(self):
@@ -52,38 +68,180 @@ class LogBuffer:
     In-memory buffer for log aggregation before database write.
 
     This is not a Django model but a utility class for batching log writes.
+    On PostgreSQL chunks are written with COPY; other backends and batches
+    containing duplicate chunks fall back to bulk_create.
     """
 
+    # LogChunk fields written per row, in COPY column order
+    COLUMNS = (
+        'step_id', 'job_id', 'step_order', 'chunk_number', 'content', 'level', 'timestamp',
+    )
+
+    # Rows per INSERT statement on the bulk_create path
+    BATCH_SIZE = 500
+
     def __init__(self, flush_size: int = 100, flush_interval: float = 1.0):
         self.buffer = []
         self.flush_size = flush_size
         self.flush_interval = flush_interval
-        self._last_flush = None
+        self._lock = threading.Lock()
+        self._timer = None
 
     def add(self, log_entry: dict) -> None:
-        """Add a log entry to the buffer."""
-        self.buffer.append(log_entry)
-        if len(self.buffer) >= self.flush_size:
+        """
+        Add a log entry to the buffer.
+
+        Flushes once flush_size entries are pending, or flush_interval
+        seconds after the first pending entry was added.
+        """
+        with self._lock:
+            self.buffer.append(log_entry)
+            full = len(self.buffer) >= self.flush_size
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self._run_flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if full:
             self.flush()
 
     def flush(self) -> list:
         """Flush buffer to database and return flushed entries."""
-        if not self.buffer:
+        # Swap the list out instead of copying it
+        with self._lock:
+            entries, self.buffer = self.buffer, []
+
+        if not entries:
             return []
 
-        entries = self.buffer.copy()
-        self.buffer.clear()
-
-        # Bulk create log chunks
-        LogChunk.objects.bulk_create([
-            LogChunk(
-                step_id=entry['step_id'],
-                chunk_number=entry['chunk_number'],
-                content=entry['content'],
-                level=entry.get('level', 'info'),
-                timestamp=entry['timestamp'],
+        self.write(entries)
+        return entries
+
+    def write(self, entries: list) -> None:
+        """
+        Write log entries to the database in one transaction.
+
+        Entries carry step_id, job_id, step_order (the step's job and
+        order), chunk_number, content and timestamp, and optionally level.
+        """
+        from apps.executions.models import Step
+
+        rows = [
+            (
+                entry['step_id'],
+                entry['job_id'],
+                entry['step_order'],
+                entry['chunk_number'],
+                entry['content'],
+                entry.get('level', LogChunk.Level.INFO),
+                entry['timestamp'],
             )
             for entry in entries
-        ], ignore_conflicts=True)
+        ]
 
-        return entries
+        next_chunk = {}
+        for entry in entries:
+            step_id = entry['step_id']
+            next_chunk[step_id] = max(next_chunk.get(step_id, 0), entry['chunk_number'] + 1)
+
+        # Only chunks that were not stored yet add to a step's count
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                try:
+                    self._copy_rows(rows)
+                    added = Counter(row[0] for row in rows)
+                except IntegrityError:
+                    # COPY has no ON CONFLICT; retry as an upsert
+                    added = self._bulk_create_rows(rows)
+            else:
+                added = self._bulk_create_rows(rows)
+
+            # One grouped UPDATE for the per-step chunk counts; the chunk
+            # sequence is moved past any caller-numbered chunk
+            Step.objects.filter(id__in=next_chunk).update(
+                log_chunk_count=Case(
+                    *[
+                        When(id=step_id, then=F('log_chunk_count') + count)
+                        for step_id, count in added.items()
+                    ],
+                    default=F('log_chunk_count'),
+                    output_field=models.PositiveIntegerField(),
+                ),
+                log_chunk_seq=Greatest(
+                    F('log_chunk_seq'),
+                    Case(
+                        *[
+                            When(id=step_id, then=Value(number))
+                            for step_id, number in next_chunk.items()
+                        ],
+                        default=F('log_chunk_seq'),
+                        output_field=models.PositiveIntegerField(),
+                    ),
+                ),
+            )
+
+    def _run_flush(self) -> None:
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Failed to flush log buffer")
+        finally:
+            # The timer thread owns its own connection
+            connection.close()
+
+    def _copy_rows(self, rows: list) -> None:
+        """Insert rows with COPY FROM STDIN (psycopg 3)."""
+        columns = ', '.join(
+            LogChunk._meta.get_field(name).column for name in self.COLUMNS
+        )
+        sql = f'COPY {LogChunk._meta.db_table} ({columns}) FROM STDIN'
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            with cursor.copy(sql) as copy:
+                for row in rows:
+                    copy.write_row(row)
+
+    def _bulk_create_rows(self, rows: list) -> Counter:
+        """
+        Insert rows in BATCH_SIZE statements.
+
+        Re-sent chunks replace the stored content where the backend supports
+        ON CONFLICT DO UPDATE, and are skipped otherwise. Returns the number
+        of newly stored chunks per step.
+        """
+        # One statement cannot upsert the same chunk twice (PostgreSQL
+        # rejects it), so a chunk repeated within the batch keeps its last copy
+        to_step_id = LogChunk._meta.get_field('step').to_python
+        unique_rows = {(to_step_id(row[0]), row[3]): row for row in rows}
+
+        added = self._count_new_chunks(unique_rows.keys())
+        objs = [
+            LogChunk(**dict(zip(self.COLUMNS, row))) for row in unique_rows.values()
+        ]
+
+        if connection.features.supports_update_conflicts_with_target:
+            LogChunk.objects.bulk_create(
+                objs,
+                batch_size=self.BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=['step', 'chunk_number'],
+                update_fields=['content', 'level', 'timestamp'],
+            )
+        else:
+            LogChunk.objects.bulk_create(
+                objs, batch_size=self.BATCH_SIZE, ignore_conflicts=True
+            )
+        return added
+
+    def _count_new_chunks(self, keys) -> Counter:
+        """Count, per step, the (step_id, chunk_number) keys not stored yet."""
+        keys = set(keys)
+        stored = set(
+            LogChunk.objects.filter(
+                step_id__in={step_id for step_id, _ in keys},
+                chunk_number__in={number for _, number in keys},
+            ).values_list('step_id', 'chunk_number')
+        )
+        return Counter(step_id for step_id, _ in keys - stored)
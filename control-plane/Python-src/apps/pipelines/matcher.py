@@ -4,15 +4,385 @@ Pipeline trigger matcher for Muelsyse-CI
 This module provides logic for matching webhook events against pipeline
 trigger configurations to determine if a pipeline should be triggered.
 """
-import fnmatch
 import logging
 import re
-from typing import Optional
+from functools import lru_cache
+from typing import Callable, Optional
+
+import orjson
 
 from apps.webhooks.parsers import PushEvent, PullRequestEvent
 
+try:
+    # Optional: linear-time DFA matching for the fused filter lists
+    import re2
+except ImportError:
+    re2 = None
+
 logger = logging.getLogger(__name__)
 
+# Trigger filter keys holding ref (branch/tag) globs and file path globs
+REF_FILTER_KEYS = ('branches', 'branches_ignore', 'tags', 'tags_ignore')
+PATH_FILTER_KEYS = ('paths', 'paths_ignore')
+
+# pull_request actions that trigger when no types are configured
+DEFAULT_PR_TYPES = ('opened', 'synchronize', 'reopened')
+
+# Bump when the compile_triggers output format changes; stored digests
+# with another version are recompiled from the trigger config
+COMPILED_TRIGGERS_VERSION = 2
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """
+    Translate a GitHub Actions style ref glob to an unanchored regex.
+
+    ** matches any character including /, * matches any character except /
+    and ? matches a single character.
+    """
+    # Escape special regex characters, then restore the wildcards
+    regex_pattern = re.escape(pattern)
+    regex_pattern = regex_pattern.replace(r'\*\*', '.*')
+    regex_pattern = regex_pattern.replace(r'\*', '[^/]*')
+    return regex_pattern.replace(r'\?', '.')
+
+
+@lru_cache(maxsize=512)
+def _compile_glob(pattern: str) -> re.Pattern:
+    """Compile a single ref glob."""
+    return re.compile(f'^{_glob_to_regex(pattern)}$')
+
+
+@lru_cache(maxsize=512)
+def _compile_glob_matcher(pattern: str) -> Callable[[str], bool]:
+    """
+    Compile a single ref glob to the cheapest predicate implementing it.
+
+    Literal names compare with ==, trailing-wildcard patterns such as
+    feature/* and release/** use startswith, and anything else falls back
+    to the compiled regex.
+    """
+    if '*' not in pattern and '?' not in pattern:
+        return pattern.__eq__
+
+    prefix = pattern.rstrip('*')
+    if '*' not in prefix and '?' not in prefix:
+        if len(pattern) - len(prefix) == 1:
+            # * stops at the next /
+            cut = len(prefix)
+            return lambda value: value.startswith(prefix) and '/' not in value[cut:]
+        return lambda value: value.startswith(prefix)
+
+    regex = _compile_glob(pattern)
+    return lambda value: regex.match(value) is not None
+
+
+def _path_glob_to_regex(pattern: str) -> str:
+    """
+    Translate a file path glob to an unanchored regex.
+
+    Follows fnmatch semantics: * matches any characters including /, ?
+    matches one character and [...] / [!...] are character sets. The output
+    only uses syntax shared by re and RE2.
+    """
+    parts = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        i += 1
+        if c == '*':
+            # Consecutive stars are equivalent to one
+            if not parts or parts[-1] != '.*':
+                parts.append('.*')
+        elif c == '?':
+            parts.append('.')
+        elif c == '[':
+            j = i
+            if j < n and pattern[j] == '!':
+                j += 1
+            if j < n and pattern[j] == ']':
+                j += 1
+            while j < n and pattern[j] != ']':
+                j += 1
+            if j >= n:
+                parts.append('\\[')
+                continue
+            if '-' not in pattern[i:j]:
+                chars = pattern[i:j].replace('\\', '\\\\')
+            else:
+                # Split on range hyphens and drop empty ranges like z-a,
+                # which re and RE2 reject
+                chunks = []
+                k = i + 2 if pattern[i] == '!' else i + 1
+                while True:
+                    k = pattern.find('-', k, j)
+                    if k < 0:
+                        break
+                    chunks.append(pattern[i:k])
+                    i = k + 1
+                    k = k + 3
+                chunk = pattern[i:j]
+                if chunk:
+                    chunks.append(chunk)
+                else:
+                    chunks[-1] += '-'
+                for k in range(len(chunks) - 1, 0, -1):
+                    if chunks[k - 1][-1] > chunks[k][0]:
+                        chunks[k - 1] = chunks[k - 1][:-1] + chunks[k][1:]
+                        del chunks[k]
+                chars = '-'.join(
+                    part.replace('\\', '\\\\').replace('-', '\\-') for part in chunks
+                )
+            # Escape characters re would read as nested sets or set operations
+            chars = re.sub(r'([&~|\[])', r'\\\1', chars)
+            i = j + 1
+            if not chars:
+                # Empty set never matches
+                parts.append('[^\\s\\S]')
+                continue
+            if chars == '!':
+                parts.append('.')
+                continue
+            if chars.startswith('!'):
+                chars = '^' + chars[1:]
+            elif chars.startswith('^'):
+                chars = '\\' + chars
+            parts.append(f'[{chars}]')
+        else:
+            parts.append(re.escape(c))
+    return ''.join(parts)
+
+
+@lru_cache(maxsize=512)
+def _compile_regex(regex: str):
+    """Compile with RE2 when available, falling back to re."""
+    if re2 is not None:
+        try:
+            return re2.compile(regex)
+        except re2.error:
+            logger.debug("RE2 rejected %r, using re", regex)
+    return re.compile(regex)
+
+
+@lru_cache(maxsize=512)
+def _compile_path_glob(pattern: str) -> re.Pattern:
+    """Compile a single file path glob."""
+    return re.compile(f'(?s:{_path_glob_to_regex(pattern)})\\Z')
+
+
+def _selectivity_key(pattern: str) -> tuple:
+    """
+    Sort key putting the most selective globs first.
+
+    Patterns without ** and with longer literal prefixes reject most values
+    after a few characters, so they are tried before broad ones.
+    """
+    prefix = re.split(r'[*?\[]', pattern, maxsplit=1)[0]
+    return ('**' in pattern, -len(prefix))
+
+
+def _plan_ref_list(patterns: tuple) -> dict:
+    """
+    Split a ref filter list by how each pattern is cheapest to check.
+
+    Returns JSON-serialisable parts: literal names ('exact'), release/**
+    style prefixes ('prefixes'), the remaining globs ordered by selectivity
+    ('globs') and, when there are several globs, their alternation regex.
+    """
+    exact = []
+    prefixes = []
+    globs = []
+    for pattern in patterns:
+        if '*' not in pattern and '?' not in pattern:
+            exact.append(pattern)
+            continue
+        prefix = pattern.rstrip('*')
+        if len(pattern) - len(prefix) >= 2 and '*' not in prefix and '?' not in prefix:
+            prefixes.append(prefix)
+        else:
+            globs.append(pattern)
+    globs.sort(key=_selectivity_key)
+
+    regex = None
+    if len(globs) > 1:
+        regex = '|'.join(f'(?:{_glob_to_regex(p)})' for p in globs)
+
+    return {'exact': exact, 'prefixes': prefixes, 'globs': globs, 'regex': regex}
+
+
+def _load_ref_list(plan: dict) -> Callable[[str], bool]:
+    """Build the predicate for a _plan_ref_list result."""
+    return _ref_list_predicate(
+        tuple(plan['exact']), tuple(plan['prefixes']), tuple(plan['globs']), plan['regex']
+    )
+
+
+@lru_cache(maxsize=256)
+def _ref_list_predicate(
+    exact: tuple, prefixes: tuple, globs: tuple, regex: Optional[str]
+) -> Callable[[str], bool]:
+    """
+    Combine the parts of a ref filter list into one predicate.
+
+    Checks run cheapest first: literal names as one frozenset lookup,
+    prefixes as one str.startswith over a tuple, then the remaining globs
+    through their specialised predicate or one alternation.
+    """
+    exact = frozenset(exact)
+
+    checks = []
+    if exact:
+        checks.append(exact.__contains__)
+    if prefixes:
+        checks.append(lambda value: value.startswith(prefixes))
+    if len(globs) == 1:
+        checks.append(_compile_glob_matcher(globs[0]))
+    elif globs:
+        compiled = _compile_regex(regex)
+        checks.append(lambda value: compiled.fullmatch(value) is not None)
+
+    if not checks:
+        return exact.__contains__
+    if len(checks) == 1:
+        return checks[0]
+    return lambda value: any(check(value) for check in checks)
+
+
+@lru_cache(maxsize=256)
+def _compile_ref_list_matcher(patterns: tuple) -> Callable[[str], bool]:
+    """Compile a ref filter list into one predicate."""
+    return _load_ref_list(_plan_ref_list(patterns))
+
+
+def _path_list_regex(patterns: tuple) -> str:
+    """
+    Build one alternation regex for a list of path globs.
+
+    Alternatives are ordered by selectivity for the backtracking re
+    engine. The result is unanchored; match it with fullmatch().
+    """
+    body = '|'.join(
+        f'(?:{_path_glob_to_regex(p)})' for p in sorted(patterns, key=_selectivity_key)
+    )
+    return f'(?s:{body})'
+
+
+def _plan_path_list(patterns: tuple) -> dict:
+    """
+    Bucket a path filter list by the leading directory of each glob.
+
+    A glob whose literal prefix spans a / (src/frontend/**) can only match
+    files under that first directory, so it goes in that directory's
+    bucket; the rest go in 'other'. Each group is one alternation regex.
+    """
+    buckets = {}
+    other = []
+    for pattern in patterns:
+        literal = re.split(r'[*?\[]', pattern, maxsplit=1)[0]
+        if '/' in literal:
+            buckets.setdefault(literal.partition('/')[0], []).append(pattern)
+        else:
+            other.append(pattern)
+
+    return {
+        'buckets': {
+            directory: _path_list_regex(tuple(group))
+            for directory, group in buckets.items()
+        },
+        'other': _path_list_regex(tuple(other)) if other else None,
+    }
+
+
+def _load_path_list(plan: dict) -> Callable[[str], bool]:
+    """Build the predicate for a _plan_path_list result."""
+    return _path_list_predicate(tuple(sorted(plan['buckets'].items())), plan['other'])
+
+
+@lru_cache(maxsize=256)
+def _path_list_predicate(buckets: tuple, other: Optional[str]) -> Callable[[str], bool]:
+    """
+    Combine the groups of a path filter list into one predicate.
+
+    A file is only checked against the bucket for its first directory and
+    the unbucketed globs, never against globs rooted elsewhere.
+    """
+    other = _compile_regex(other) if other else None
+    if not buckets:
+        return lambda path: other.fullmatch(path) is not None
+
+    buckets = {directory: _compile_regex(regex) for directory, regex in buckets}
+
+    def matches(path: str) -> bool:
+        if other is not None and other.fullmatch(path) is not None:
+            return True
+        regex = buckets.get(path.partition('/')[0])
+        return regex is not None and regex.fullmatch(path) is not None
+
+    return matches
+
+
+@lru_cache(maxsize=256)
+def _compile_path_list_matcher(patterns: tuple) -> Callable[[str], bool]:
+    """Compile a path filter list into one predicate."""
+    return _load_path_list(_plan_path_list(patterns))
+
+
+def _pattern_tuple(patterns) -> tuple:
+    """
+    Normalise a filter value from YAML into a tuple of strings.
+
+    The schema does not pin these down, so a bare scalar counts as a
+    one-element list, numbers and booleans are stringified and nested
+    mappings or lists are skipped.
+    """
+    if isinstance(patterns, (str, int, float)):
+        patterns = (patterns,)
+    elif not isinstance(patterns, (list, tuple)):
+        return ()
+    return tuple(
+        pattern if isinstance(pattern, str) else str(pattern)
+        for pattern in patterns
+        if isinstance(pattern, (str, int, float))
+    )
+
+
+def compile_triggers(triggers: dict) -> dict:
+    """
+    Digest a pipeline's 'on' section into a JSON-serialisable form.
+
+    Stored on PipelineConfig.compiled_triggers so glob translation happens
+    once per config version. Every event configured with a filter mapping
+    gets its ref filters as _plan_ref_list parts and its path filters as
+    _plan_path_list buckets; the allowed pull_request action types are
+    normalised alongside.
+    """
+    events = {}
+    if isinstance(triggers, dict):
+        for event_name, event_config in triggers.items():
+            if not isinstance(event_config, dict):
+                continue
+            filters = {}
+            for key in REF_FILTER_KEYS:
+                patterns = _pattern_tuple(event_config.get(key))
+                if patterns:
+                    filters[key] = _plan_ref_list(patterns)
+            for key in PATH_FILTER_KEYS:
+                patterns = _pattern_tuple(event_config.get(key))
+                if patterns:
+                    filters[key] = _plan_path_list(patterns)
+            events[event_name] = filters
+
+    pr_config = triggers.get('pull_request') if isinstance(triggers, dict) else None
+    types = DEFAULT_PR_TYPES
+    if isinstance(pr_config, dict):
+        types = _pattern_tuple(pr_config.get('types', DEFAULT_PR_TYPES))
+
+    return {
+        'version': COMPILED_TRIGGERS_VERSION,
+        'events': events,
+        'pr_types': list(types),
+    }
+
 
 class PipelineMatcher:
     """
@@ -22,17 +392,35 @@ class PipelineMatcher:
     for push and pull_request events.
     """
 
-    def __init__(self, parsed_config: dict):
+    __slots__ = ('config', 'triggers', '_filters', '_pr_types')
+
+    def __init__(self, parsed_config: dict, compiled_triggers: Optional[dict] = None):
         """
         Initialize the matcher with a parsed pipeline configuration.
 
         Args:
             parsed_config: The parsed pipeline configuration dictionary
                           containing the 'on' trigger configuration.
+            compiled_triggers: Optional compile_triggers() output for the
+                          same configuration, as stored on PipelineConfig.
+                          Missing or outdated digests are recompiled.
         """
         self.config = parsed_config
         self.triggers = parsed_config.get('on', {})
 
+        if not compiled_triggers or compiled_triggers.get('version') != COMPILED_TRIGGERS_VERSION:
+            compiled_triggers = compile_triggers(self.triggers)
+
+        # Per event: filter key -> ref or path predicate
+        self._filters = {
+            event_name: {
+                key: _load_ref_list(spec) if key in REF_FILTER_KEYS else _load_path_list(spec)
+                for key, spec in filters.items()
+            }
+            for event_name, filters in compiled_triggers['events'].items()
+        }
+        self._pr_types = frozenset(compiled_triggers['pr_types'])
+
     def matches_push(self, event: PushEvent) -> bool:
         """
         Check if a push event matches the pipeline's push trigger configuration.
@@ -53,77 +441,74 @@ class PipelineMatcher:
         if push_config == {} or push_config is True:
             return True
 
+        filters = self._filters.get('push', {})
+
         # Handle tag pushes
         if event.is_tag:
-            return self._matches_tag_push(event, push_config)
+            return self._matches_tag_push(event, filters)
 
         # Handle branch pushes
-        return self._matches_branch_push(event, push_config)
+        return self._matches_branch_push(event, filters)
 
-    def _matches_branch_push(self, event: PushEvent, config: dict) -> bool:
-        """Check if a branch push matches the configuration."""
+    def _matches_branch_push(self, event: PushEvent, filters: dict) -> bool:
+        """Check if a branch push matches the compiled push filters."""
         branch = event.branch
 
         # Check branches filter
-        branches = config.get('branches', [])
-        branches_ignore = config.get('branches_ignore', [])
+        branches = filters.get('branches')
+        branches_ignore = filters.get('branches_ignore')
 
         # If branches-ignore is specified and branch matches, don't trigger
-        if branches_ignore and self._matches_pattern_list(branch, branches_ignore):
-            logger.debug(f"Branch {branch} matches branches-ignore pattern")
+        if branches_ignore and branches_ignore(branch):
+            logger.debug("Branch %s matches branches-ignore pattern", branch)
             return False
 
         # If branches is specified, branch must match
-        if branches and not self._matches_pattern_list(branch, branches):
-            logger.debug(f"Branch {branch} does not match branches pattern")
+        if branches and not branches(branch):
+            logger.debug("Branch %s does not match branches pattern", branch)
             return False
 
         # Check paths filter
-        paths = config.get('paths', [])
-        paths_ignore = config.get('paths_ignore', [])
+        paths = filters.get('paths')
+        paths_ignore = filters.get('paths_ignore')
 
         if paths or paths_ignore:
-            changed_files = event.changed_files
-
-            # If paths-ignore is specified and all files match, don't trigger
-            if paths_ignore:
-                all_ignored = all(
-                    self._matches_path_pattern_list(f, paths_ignore)
-                    for f in changed_files
-                )
-                if all_ignored and changed_files:
+            # Read once; the file list is shared by both filters
+            files = event.changed_files
+
+            # If paths-ignore is specified and all files match, don't trigger.
+            # map() keeps the per-file loop in C and all()/any() still stop
+            # at the first decisive file.
+            if paths_ignore and files:
+                if all(map(paths_ignore, files)):
                     logger.debug("All changed files match paths-ignore pattern")
                     return False
 
             # If paths is specified, at least one file must match
             if paths:
-                any_matches = any(
-                    self._matches_path_pattern_list(f, paths)
-                    for f in changed_files
-                )
-                if not any_matches:
+                if not any(map(paths, files)):
                     logger.debug("No changed files match paths pattern")
                     return False
 
         return True
 
-    def _matches_tag_push(self, event: PushEvent, config: dict) -> bool:
-        """Check if a tag push matches the configuration."""
+    def _matches_tag_push(self, event: PushEvent, filters: dict) -> bool:
+        """Check if a tag push matches the compiled push filters."""
         tag = event.tag
         if not tag:
             return False
 
-        tags = config.get('tags', [])
-        tags_ignore = config.get('tags_ignore', [])
+        tags = filters.get('tags')
+        tags_ignore = filters.get('tags_ignore')
 
         # If tags-ignore is specified and tag matches, don't trigger
-        if tags_ignore and self._matches_pattern_list(tag, tags_ignore):
-            logger.debug(f"Tag {tag} matches tags-ignore pattern")
+        if tags_ignore and tags_ignore(tag):
+            logger.debug("Tag %s matches tags-ignore pattern", tag)
             return False
 
         # If tags is specified, tag must match
-        if tags and not self._matches_pattern_list(tag, tags):
-            logger.debug(f"Tag {tag} does not match tags pattern")
+        if tags and not tags(tag):
+            logger.debug("Tag %s does not match tags pattern", tag)
             return False
 
         # If no tags filter specified, don't trigger on tags
@@ -149,30 +534,30 @@ class PipelineMatcher:
         if pr_config is None:
             return False
 
-        # Empty config means trigger on default actions
-        if pr_config == {} or pr_config is True:
-            pr_config = {'types': ['opened', 'synchronize', 'reopened']}
-
-        # Check action types
-        types = pr_config.get('types', ['opened', 'synchronize', 'reopened'])
-        if event.action not in types:
-            logger.debug(f"PR action {event.action} not in allowed types: {types}")
+        # Check action types (defaults apply to an empty config)
+        if event.action not in self._pr_types:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "PR action %s not in allowed types: %s",
+                    event.action, sorted(self._pr_types),
+                )
             return False
 
         # Check target branch filter (base branch)
-        branches = pr_config.get('branches', [])
-        branches_ignore = pr_config.get('branches_ignore', [])
+        filters = self._filters.get('pull_request', {})
+        branches = filters.get('branches')
+        branches_ignore = filters.get('branches_ignore')
 
         base_branch = event.base_branch
 
         # If branches-ignore is specified and branch matches, don't trigger
-        if branches_ignore and self._matches_pattern_list(base_branch, branches_ignore):
-            logger.debug(f"Base branch {base_branch} matches branches-ignore pattern")
+        if branches_ignore and branches_ignore(base_branch):
+            logger.debug("Base branch %s matches branches-ignore pattern", base_branch)
             return False
 
         # If branches is specified, branch must match
-        if branches and not self._matches_pattern_list(base_branch, branches):
-            logger.debug(f"Base branch {base_branch} does not match branches pattern")
+        if branches and not branches(base_branch):
+            logger.debug("Base branch %s does not match branches pattern", base_branch)
             return False
 
         # Note: paths filtering for PRs would require API call to get changed files
@@ -184,12 +569,10 @@ class PipelineMatcher:
         """
         Check if a value matches any pattern in the list.
 
-        Supports glob patterns with *, **, and ? wildcards.
+        Supports glob patterns with *, **, and ? wildcards. Exact names
+        are checked with a set lookup before any glob.
         """
-        for pattern in patterns:
-            if self._matches_pattern(value, pattern):
-                return True
-        return False
+        return _compile_ref_list_matcher(tuple(patterns))(value)
 
     def _matches_pattern(self, value: str, pattern: str) -> bool:
         """
@@ -200,47 +583,16 @@ class PipelineMatcher:
         - Glob patterns: *, **, ?
         - Feature branch patterns like feature/* or release/**
         """
-        # Exact match
-        if value == pattern:
-            return True
-
-        # Convert GitHub Actions style pattern to fnmatch pattern
-        # ** matches any character including /
-        # * matches any character except /
-
-        # First, handle ** by replacing with a special marker
-        regex_pattern = pattern
-
-        # Escape special regex characters except * and ?
-        regex_pattern = re.escape(regex_pattern)
-
-        # Restore * and ? and convert to regex
-        # \*\* -> .*
-        regex_pattern = regex_pattern.replace(r'\*\*', '.*')
-        # \* -> [^/]*
-        regex_pattern = regex_pattern.replace(r'\*', '[^/]*')
-        # \? -> .
-        regex_pattern = regex_pattern.replace(r'\?', '.')
-
-        # Anchor the pattern
-        regex_pattern = f'^{regex_pattern}$'
-
-        try:
-            return bool(re.match(regex_pattern, value))
-        except re.error:
-            logger.warning(f"Invalid pattern: {pattern}")
-            return False
+        return _compile_glob_matcher(pattern)(value)
 
     def _matches_path_pattern_list(self, path: str, patterns: list) -> bool:
         """
         Check if a file path matches any pattern in the list.
 
-        Supports glob patterns for file paths.
+        Supports glob patterns for file paths. Only the globs that could
+        apply to the path's first directory are checked.
         """
-        for pattern in patterns:
-            if self._matches_path_pattern(path, pattern):
-                return True
-        return False
+        return bool(patterns) and _compile_path_list_matcher(tuple(patterns))(path)
 
     def _matches_path_pattern(self, path: str, pattern: str) -> bool:
         """
@@ -251,30 +603,36 @@ class PipelineMatcher:
         - * for any filename
         - Exact directory/file matching
         """
-        # Use fnmatch for simple patterns
-        if fnmatch.fnmatch(path, pattern):
-            return True
-
-        # Handle ** pattern for any directory depth
-        if '**' in pattern:
-            # Convert ** to regex
-            regex_pattern = pattern.replace('.', r'\.')
-            regex_pattern = regex_pattern.replace('**', '.*')
-            regex_pattern = regex_pattern.replace('*', '[^/]*')
-            regex_pattern = f'^{regex_pattern}$'
-
-            try:
-                return bool(re.match(regex_pattern, path))
-            except re.error:
-                pass
-
-        return False
+        return _compile_path_glob(pattern).match(path) is not None
 
     def get_trigger_types(self) -> list:
         """Get list of configured trigger types."""
         return list(self.triggers.keys())
 
 
+def get_matcher(parsed_config: dict) -> PipelineMatcher:
+    """
+    Get a shared, already compiled matcher for a pipeline configuration.
+
+    Matchers are cached by their canonical trigger JSON, so pipelines with
+    the same triggers share one instance. Cached matchers only carry the
+    'on' section as their config.
+    """
+    try:
+        triggers_json = orjson.dumps(
+            parsed_config.get('on', {}), option=orjson.OPT_SORT_KEYS
+        )
+    except TypeError:
+        # Not JSON-shaped (e.g. non-string keys); build an uncached matcher
+        return PipelineMatcher(parsed_config)
+    return _cached_matcher(triggers_json)
+
+
+@lru_cache(maxsize=256)
+def _cached_matcher(triggers_json: bytes) -> PipelineMatcher:
+    return PipelineMatcher({'on': orjson.loads(triggers_json)})
+
+
 def matches_pipeline_triggers(
     parsed_config: dict,
     event_type: str,
@@ -291,7 +649,7 @@ def matches_pipeline_triggers(
     Returns:
         True if the event should trigger the pipeline.
     """
-    matcher = PipelineMatcher(parsed_config)
+    matcher = get_matcher(parsed_config)
 
     if event_type == 'push' and isinstance(event, PushEvent):
         return matcher.matches_push(event)
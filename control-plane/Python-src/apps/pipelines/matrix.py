@@ -4,7 +4,9 @@ Matrix expansion utilities for Muelsyse-CI
 This module handles expanding job matrices into individual job instances.
 """
 import itertools
-from typing import Any, Generator
+import math
+from operator import itemgetter
+from typing import Any, Generator, Iterator, Optional
 from copy import deepcopy
 
 
@@ -16,7 +18,9 @@ def expand_matrix(strategy: dict) -> Generator[dict, None, None]:
         strategy: Job strategy configuration containing matrix
 
     Yields:
-        dict: Matrix variable values for each combination
+        dict: Matrix variable values for each combination. Include entries
+        are yielded as copies; the deep copy is only paid for entries with
+        nested lists or dicts.
 
     Example:
         strategy = {
@@ -48,19 +52,117 @@ def expand_matrix(strategy: dict) -> Generator[dict, None, None]:
 
     # Generate all combinations
     if variables:
-        keys = list(variables.keys())
-        values = [variables[k] for k in keys]
+        keys, rows = iter_matrix_rows(variables, exclude)
+        for row in rows:
+            yield dict(zip(keys, row))
 
-        for combo in itertools.product(*values):
-            combination = dict(zip(keys, combo))
+    # Add included configurations. Entries are normally flat scalars, so a
+    # shallow copy suffices; only nested containers need a deep copy.
+    for included in include:
+        if any(isinstance(v, (dict, list)) for v in included.values()):
+            yield deepcopy(included)
+        else:
+            yield dict(included)
 
-            # Check if this combination should be excluded
-            if not _should_exclude(combination, exclude):
-                yield combination
 
-    # Add included configurations
-    for included in include:
-        yield deepcopy(included)
+def iter_matrix_rows(variables: dict, exclude: list) -> tuple[list, Iterator[tuple]]:
+    """
+    Generate the matrix product as plain tuples, with excludes applied.
+
+    Returns the variable keys and an iterator of value tuples in the same
+    order. Callers that only need the values (counting, hashing, building
+    job rows) avoid a dict per combination; expand_matrix zips them into
+    dicts. Keys are arbitrary strings such as 'node-version', so rows are
+    not namedtuples.
+
+    Args:
+        variables: Matrix variables mapping each key to its values
+        exclude: Exclude patterns
+
+    Returns:
+        (keys, rows)
+    """
+    keys = list(variables.keys())
+    values = [variables[k] for k in keys]
+    exclude_index = _build_exclude_index(variables, exclude)
+
+    if exclude_index is None:
+        # Check each combination against the raw patterns
+        rows = (
+            combo for combo in itertools.product(*values)
+            if not _should_exclude(dict(zip(keys, combo)), exclude)
+        )
+        return keys, rows
+
+    # Single-key excludes shrink their axis before the product is taken;
+    # only multi-key excludes are checked per combination
+    checks = []
+    last_checked = -1
+    for positions, excluded in exclude_index:
+        if len(positions) == 1:
+            axis = positions[0]
+            values[axis] = [v for v in values[axis] if v not in excluded]
+        else:
+            checks.append((itemgetter(*positions), excluded))
+            last_checked = max(last_checked, *positions)
+
+    if not checks:
+        return keys, itertools.product(*values)
+
+    # Multi-key excludes only look at axes up to last_checked, so they are
+    # checked once per prefix over those axes and each surviving prefix is
+    # extended with the whole block of trailing combinations
+    prefixes = (
+        prefix for prefix in itertools.product(*values[:last_checked + 1])
+        if not any(get(prefix) in excluded for get, excluded in checks)
+    )
+    suffixes = list(itertools.product(*values[last_checked + 1:]))
+    if suffixes == [()]:
+        return keys, prefixes
+
+    rows = (prefix + suffix for prefix in prefixes for suffix in suffixes)
+    return keys, rows
+
+
+def _build_exclude_index(variables: dict, exclude_list: list) -> Optional[list]:
+    """
+    Index exclude patterns by the matrix keys they constrain.
+
+    Returns a list of (positions, excluded) pairs, one per distinct key
+    set: positions are the keys' indexes in a product tuple and excluded
+    holds the projections onto them to drop (a bare value for single-key
+    sets), so each key set costs one set lookup. Patterns naming a key
+    outside the matrix can never match and are skipped.
+
+    Returns None when a pattern is empty or a value is unhashable; callers
+    then fall back to _should_exclude.
+    """
+    positions = {key: i for i, key in enumerate(variables)}
+    groups = {}
+    try:
+        for pattern in exclude_list:
+            if not pattern:
+                return None
+            if not all(key in positions for key in pattern):
+                continue
+            pattern_keys = tuple(sorted(pattern, key=positions.__getitem__))
+            projection = tuple(pattern[key] for key in pattern_keys)
+            groups.setdefault(pattern_keys, set()).add(
+                projection[0] if len(projection) == 1 else projection
+            )
+
+        # Projections of generated combinations must be hashable too
+        for pattern_keys in groups:
+            for key in pattern_keys:
+                for value in variables[key]:
+                    hash(value)
+    except TypeError:
+        return None
+
+    return [
+        (tuple(positions[key] for key in pattern_keys), excluded)
+        for pattern_keys, excluded in groups.items()
+    ]
 
 
 def _should_exclude(combination: dict, exclude_list: list) -> bool:
@@ -89,17 +191,75 @@ def _matches_pattern(combination: dict, pattern: dict) -> bool:
     return True
 
 
+# Above this many exclude patterns, counting enumerates the product
+# instead of using inclusion-exclusion (2**n pattern subsets)
+MAX_COUNTED_EXCLUDES = 10
+
+
 def count_matrix_combinations(strategy: dict) -> int:
     """
     Count the total number of matrix combinations.
 
+    The product size and the combinations removed by exclude patterns are
+    computed arithmetically, without generating the combinations.
+
     Args:
         strategy: Job strategy configuration
 
     Returns:
         Number of combinations
     """
-    return sum(1 for _ in expand_matrix(strategy))
+    matrix = strategy.get('matrix', {})
+
+    if not matrix:
+        return 1
+
+    variables = matrix.get('variables', {})
+    include = matrix.get('include', [])
+    exclude = matrix.get('exclude', [])
+
+    if not variables:
+        return len(include)
+
+    # Patterns naming a key outside the matrix never match
+    patterns = [p for p in exclude if all(key in variables for key in p)]
+    if len(patterns) > MAX_COUNTED_EXCLUDES:
+        return sum(1 for _ in expand_matrix(strategy))
+
+    total = math.prod(len(values) for values in variables.values())
+    return total - _count_excluded(variables, patterns) + len(include)
+
+
+def _count_excluded(variables: dict, patterns: list) -> int:
+    """
+    Count product combinations matched by at least one exclude pattern.
+
+    Uses inclusion-exclusion: the combinations matched by every pattern in
+    a subset are counted per key, as the number of that key's values equal
+    to all of the subset's constraints on it.
+    """
+    excluded = 0
+    for size in range(1, len(patterns) + 1):
+        sign = 1 if size % 2 else -1
+        for subset in itertools.combinations(patterns, size):
+            constraints = {}
+            for pattern in subset:
+                for key, value in pattern.items():
+                    constraints.setdefault(key, []).append(value)
+
+            matched = 1
+            for key, values in variables.items():
+                if key in constraints:
+                    wanted = constraints[key]
+                    matched *= sum(
+                        1 for v in values if all(v == w for w in wanted)
+                    )
+                else:
+                    matched *= len(values)
+                if not matched:
+                    break
+            excluded += sign * matched
+    return excluded
 
 
 def get_matrix_display_name(job_name: str, matrix_values: dict) -> str:
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 01:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pipelines', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pipelineconfig',
+            name='compiled_triggers',
+            field=models.JSONField(default=dict, editable=False),
+        ),
+    ]
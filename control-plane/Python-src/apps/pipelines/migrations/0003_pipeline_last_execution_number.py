@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-16 01:32
+
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+
+
+def backfill_last_execution_number(apps, schema_editor):
+    Pipeline = apps.get_model('pipelines', 'Pipeline')
+    Execution = apps.get_model('executions', 'Execution')
+    last_number = Execution.objects.filter(
+        pipeline_id=OuterRef('pk')
+    ).order_by().values('pipeline_id').annotate(n=Max('number')).values('n')
+    Pipeline.objects.filter(
+        id__in=Execution.objects.values('pipeline_id')
+    ).update(last_execution_number=Subquery(last_number[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pipelines', '0002_pipelineconfig_compiled_triggers'),
+        ('executions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pipeline',
+            name='last_execution_number',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_last_execution_number, migrations.RunPython.noop),
+    ]
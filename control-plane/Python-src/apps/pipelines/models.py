@@ -4,6 +4,7 @@ Pipeline models for Muelsyse-CI
 This module contains the core models for pipeline definition and configuration.
 """
 import uuid
+from functools import cached_property
 from django.db import models
 from apps.core.models import TenantAwareModel
 
@@ -39,6 +40,8 @@ class Pipeline(TenantAwareModel):
     # Status
     is_active = models.BooleanField(default=True)
     last_execution_at = models.DateTimeField(null=True, blank=True)
+    # Highest execution number handed out, see Execution.allocate_number()
+    last_execution_number = models.PositiveIntegerField(default=0)
 
     class Meta:
         ordering = ['name']
@@ -47,13 +50,41 @@ class Pipeline(TenantAwareModel):
             models.Index(fields=['tenant', 'is_active']),
         ]
 
+    # Written only by Execution.allocate_number()'s UPDATE
+    ALLOCATION_FIELDS = frozenset({'last_execution_number', 'last_execution_at'})
+
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # A full save of a stale instance must not roll the execution
+        # counter back, or the next allocation reuses an existing number
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.attname not in deferred
+                and field.attname not in self.ALLOCATION_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
     def get_latest_config(self):
         """Get the latest valid configuration for this pipeline."""
+        # Set by prefetch_latest_config()
+        if hasattr(self, 'latest_valid_configs'):
+            return self.latest_valid_configs[0] if self.latest_valid_configs else None
         return self.configs.filter(is_valid=True).order_by('-version').first()
 
+    @staticmethod
+    def prefetch_latest_config() -> models.Prefetch:
+        """Prefetch the latest valid configuration of each pipeline in one query."""
+        return models.Prefetch(
+            'configs',
+            queryset=PipelineConfig.objects.filter(is_valid=True).order_by('-version')[:1],
+            to_attr='latest_valid_configs',
+        )
+
 
 class PipelineConfig(models.Model):
     """
@@ -75,6 +106,9 @@ class PipelineConfig(models.Model):
     # Parsed and validated configuration
     parsed_config = models.JSONField(default=dict)
 
+    # Trigger filters digested by compile_triggers(), refreshed on save
+    compiled_triggers = models.JSONField(default=dict, editable=False)
+
     # Source information
     commit_sha = models.CharField(max_length=40, blank=True)
     commit_message = models.TextField(blank=True)
@@ -91,3 +125,41 @@ class PipelineConfig(models.Model):
 
     def __str__(self):
         return f"{self.pipeline.name} v{self.version}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Snapshot the stored YAML (unless deferred) so save() can tell
+        # whether parsed_config needs refreshing
+        instance._loaded_config_yaml = instance.__dict__.get('config_yaml')
+        return instance
+
+    def save(self, *args, **kwargs):
+        from apps.pipelines.matcher import compile_triggers
+        if self._needs_parse():
+            self.parse_config_yaml()
+        self.compiled_triggers = compile_triggers(self.parsed_config.get('on', {}))
+        super().save(*args, **kwargs)
+
+    def _needs_parse(self) -> bool:
+        """Whether parsed_config is missing or stale for config_yaml."""
+        if 'config_yaml' not in self.__dict__:
+            return False
+        if self._state.adding:
+            return not self.parsed_config and not self.validation_errors
+        return self.config_yaml != getattr(self, '_loaded_config_yaml', self.config_yaml)
+
+    def parse_config_yaml(self):
+        """Parse config_yaml into parsed_config and the validation fields."""
+        from apps.pipelines.parser import parse_pipeline_yaml
+        parsed, errors = parse_pipeline_yaml(self.config_yaml)
+        self.parsed_config = parsed
+        self.is_valid = not errors
+        self.validation_errors = errors
+        self._loaded_config_yaml = self.config_yaml
+
+    @cached_property
+    def compiled_matcher(self):
+        """PipelineMatcher built from the stored trigger digest."""
+        from apps.pipelines.matcher import PipelineMatcher
+        return PipelineMatcher(self.parsed_config, self.compiled_triggers)
@@ -4,64 +4,22 @@ Pipeline YAML parser for Muelsyse-CI
 This module implements a GitHub Actions compatible YAML parser.
 """
 import re
+from collections import deque
+from functools import lru_cache
 from typing import Any
+import orjson
 import yaml
-from dataclasses import dataclass, field
 
 from apps.core.exceptions import PipelineValidationError
 
+try:
+    # libyaml-backed loader; same safe tag set as yaml.SafeLoader
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
 
-@dataclass
-class TriggerConfig:
-    """Parsed trigger configuration."""
-    push: dict = field(default_factory=dict)
-    pull_request: dict = field(default_factory=dict)
-    schedule: list = field(default_factory=list)
-    workflow_dispatch: dict = field(default_factory=dict)
-    webhook: dict = field(default_factory=dict)
-
-
-@dataclass
-class StepConfig:
-    """Parsed step configuration."""
-    name: str = ""
-    id: str = ""
-    run: str = ""
-    uses: str = ""
-    with_inputs: dict = field(default_factory=dict)
-    env: dict = field(default_factory=dict)
-    working_directory: str = ""
-    shell: str = "bash"
-    condition: str = ""
-    continue_on_error: bool = False
-    timeout_minutes: int = 60
-
-
-@dataclass
-class JobConfig:
-    """Parsed job configuration."""
-    name: str = ""
-    runs_on: list = field(default_factory=list)
-    needs: list = field(default_factory=list)
-    condition: str = ""
-    container: dict = field(default_factory=dict)
-    services: dict = field(default_factory=dict)
-    env: dict = field(default_factory=dict)
-    steps: list = field(default_factory=list)
-    strategy: dict = field(default_factory=dict)
-    timeout_minutes: int = 60
-    outputs: dict = field(default_factory=dict)
-
-
-@dataclass
-class PipelineConfigParsed:
-    """Parsed pipeline configuration."""
-    name: str = ""
-    on: TriggerConfig = field(default_factory=TriggerConfig)
-    env: dict = field(default_factory=dict)
-    defaults: dict = field(default_factory=dict)
-    concurrency: dict = field(default_factory=dict)
-    jobs: dict = field(default_factory=dict)
+# Matrix keys that configure the matrix rather than name a variable
+_MATRIX_RESERVED = frozenset({'include', 'exclude'})
 
 
 class PipelineParser:
@@ -69,6 +27,51 @@ class PipelineParser:
     Parser for GitHub Actions style pipeline YAML configurations.
     """
 
+    # Job keys must start with a letter or underscore and contain only
+    # alphanumeric characters, underscores, or hyphens
+    _JOB_KEY_RE = re.compile(r'[a-zA-Z_][a-zA-Z0-9_-]*')
+
+    # Cron expressions have 5 or 6 whitespace separated fields
+    _CRON_FIELDS_RE = re.compile(r'\s*\S+(?:\s+\S+){4,5}\s*')
+
+    # Step YAML key -> parsed step field
+    _STEP_KEYS = {
+        'name': 'name',
+        'id': 'id',
+        'run': 'run',
+        'uses': 'uses',
+        'with': 'with',
+        'env': 'env',
+        'working-directory': 'working_directory',
+        'shell': 'shell',
+        'if': 'condition',
+        'continue-on-error': 'continue_on_error',
+        'timeout-minutes': 'timeout_minutes',
+    }
+
+    # Job YAML key -> (parsed job field, method parsing its value or None)
+    _JOB_KEYS = {
+        'name': ('name', None),
+        'runs-on': ('runs_on', '_normalize_runs_on'),
+        'needs': ('needs', '_normalize_list'),
+        'if': ('condition', None),
+        'container': ('container', '_parse_container'),
+        'services': ('services', '_parse_services'),
+        'env': ('env', None),
+        'steps': ('steps', '_parse_steps'),
+        'strategy': ('strategy', '_parse_strategy'),
+        'timeout-minutes': ('timeout_minutes', None),
+        'outputs': ('outputs', None),
+    }
+
+    # Trigger name -> method parsing its configuration
+    _TRIGGER_HANDLERS = {
+        'push': '_parse_push_trigger',
+        'pull_request': '_parse_pr_trigger',
+        'schedule': '_parse_schedule_trigger',
+        'workflow_dispatch': '_parse_workflow_dispatch',
+    }
+
     def __init__(self):
         self.errors: list[str] = []
         self.warnings: list[str] = []
@@ -84,7 +87,7 @@ class PipelineParser:
         self.warnings = []
 
         try:
-            raw_config = yaml.safe_load(yaml_content)
+            raw_config = yaml.load(yaml_content, Loader=_SafeLoader)
         except yaml.YAMLError as e:
             return {}, [f"YAML syntax error: {e}"]
 
@@ -114,36 +117,23 @@ class PipelineParser:
 
     def _parse_triggers(self, on_config) -> dict:
         """Parse trigger configuration."""
-        if isinstance(on_config, str):
+        # The YAML loader only builds plain str/list/dict, so section
+        # parsers compare exact types rather than walking the MRO
+        if type(on_config) is str:
             # Simple trigger: on: push
             return {on_config: {}}
 
-        if isinstance(on_config, list):
+        if type(on_config) is list:
             # List of triggers: on: [push, pull_request]
             return {trigger: {} for trigger in on_config}
 
-        if isinstance(on_config, dict):
-            triggers = {}
-
-            # Push trigger
-            if 'push' in on_config:
-                triggers['push'] = self._parse_push_trigger(on_config['push'])
-
-            # Pull request trigger
-            if 'pull_request' in on_config:
-                triggers['pull_request'] = self._parse_pr_trigger(on_config['pull_request'])
-
-            # Schedule trigger
-            if 'schedule' in on_config:
-                triggers['schedule'] = self._parse_schedule_trigger(on_config['schedule'])
-
-            # Workflow dispatch (manual trigger)
-            if 'workflow_dispatch' in on_config:
-                triggers['workflow_dispatch'] = self._parse_workflow_dispatch(
-                    on_config['workflow_dispatch']
-                )
-
-            return triggers
+        if type(on_config) is dict:
+            # One pass over the configured triggers; unknown ones are dropped
+            return {
+                trigger: getattr(self, self._TRIGGER_HANDLERS[trigger])(config)
+                for trigger, config in on_config.items()
+                if trigger in self._TRIGGER_HANDLERS
+            }
 
         return {}
 
@@ -206,10 +196,10 @@ class PipelineParser:
 
     def _parse_concurrency(self, config) -> dict:
         """Parse concurrency configuration."""
-        if isinstance(config, str):
+        if type(config) is str:
             return {'group': config, 'cancel_in_progress': False}
 
-        if isinstance(config, dict):
+        if type(config) is dict:
             return {
                 'group': config.get('group', ''),
                 'cancel_in_progress': config.get('cancel-in-progress', False),
@@ -224,34 +214,56 @@ class PipelineParser:
         if not jobs_config:
             return jobs
 
+        # (job, needed job) pairs, checked once every job is known
+        dependencies = []
+
         for job_key, job_config in jobs_config.items():
             if not self._validate_job_key(job_key):
                 self.errors.append(f"Invalid job key: {job_key}")
                 continue
 
-            jobs[job_key] = self._parse_job(job_key, job_config)
+            job = self._parse_job(job_key, job_config)
+            jobs[job_key] = job
+            dependencies.extend((job_key, needed_job) for needed_job in job['needs'])
+
+        # Validate that all job dependencies exist
+        for job_key, needed_job in dependencies:
+            if needed_job not in jobs:
+                self.errors.append(
+                    f"Job '{job_key}' depends on non-existent job '{needed_job}'"
+                )
 
-        # Validate job dependencies
-        self._validate_job_dependencies(jobs)
+        # Check for circular dependencies
+        self._check_circular_dependencies(jobs)
 
         return jobs
 
     def _parse_job(self, job_key: str, config: dict) -> dict:
         """Parse a single job configuration."""
         job = {
-            'name': config.get('name', job_key),
-            'runs_on': self._normalize_runs_on(config.get('runs-on', [])),
-            'needs': self._normalize_list(config.get('needs', [])),
-            'condition': config.get('if', ''),
-            'container': self._parse_container(config.get('container')),
-            'services': self._parse_services(config.get('services', {})),
-            'env': config.get('env', {}),
-            'steps': self._parse_steps(config.get('steps', [])),
-            'strategy': self._parse_strategy(config.get('strategy', {})),
-            'timeout_minutes': config.get('timeout-minutes', 60),
-            'outputs': config.get('outputs', {}),
+            'name': job_key,
+            'runs_on': [],
+            'needs': [],
+            'condition': '',
+            'container': {},
+            'services': {},
+            'env': {},
+            'steps': [],
+            'strategy': {},
+            'timeout_minutes': 60,
+            'outputs': {},
         }
 
+        # One pass over the job's own keys; absent keys keep their defaults,
+        # which are what the section parsers return for empty input
+        job_keys = self._JOB_KEYS
+        for key, value in config.items():
+            spec = job_keys.get(key)
+            if spec is None:
+                continue
+            field_name, parse = spec
+            job[field_name] = getattr(self, parse)(value) if parse else value
+
         if not job['runs_on']:
             self.errors.append(f"Job '{job_key}' must specify 'runs-on'")
 
@@ -265,34 +277,38 @@ class PipelineParser:
         if config is None:
             return {}
 
-        if isinstance(config, str):
+        if type(config) is str:
             return {'image': config}
 
-        return {
-            'image': config.get('image', ''),
-            'credentials': config.get('credentials', {}),
-            'env': config.get('env', {}),
-            'ports': config.get('ports', []),
-            'volumes': config.get('volumes', []),
-            'options': config.get('options', ''),
-        }
+        return self._parse_container_fields(config)
 
     def _parse_services(self, services_config: dict) -> dict:
         """Parse service containers configuration."""
         services = {}
 
         for name, config in services_config.items():
-            services[name] = {
-                'image': config.get('image', ''),
-                'credentials': config.get('credentials', {}),
-                'env': config.get('env', {}),
-                'ports': config.get('ports', []),
-                'volumes': config.get('volumes', []),
-                'options': config.get('options', ''),
-            }
+            services[name] = self._parse_container_fields(config)
 
         return services
 
+    def _parse_container_fields(self, config: dict) -> dict:
+        """Parse the fields shared by job and service containers."""
+        container = {
+            'image': '',
+            'credentials': {},
+            'env': {},
+            'ports': [],
+            'volumes': [],
+            'options': '',
+        }
+
+        # Output fields are named like their YAML keys
+        for key, value in config.items():
+            if key in container:
+                container[key] = value
+
+        return container
+
     def _parse_strategy(self, config: dict) -> dict:
         """Parse job strategy (matrix)."""
         if not config:
@@ -311,7 +327,7 @@ class PipelineParser:
                 'exclude': matrix.get('exclude', []),
                 'variables': {
                     k: v for k, v in matrix.items()
-                    if k not in ('include', 'exclude')
+                    if k not in _MATRIX_RESERVED
                 },
             }
 
@@ -331,19 +347,26 @@ class PipelineParser:
     def _parse_step(self, index: int, config: dict) -> dict:
         """Parse a single step."""
         step = {
-            'name': config.get('name', f'Step {index + 1}'),
-            'id': config.get('id', ''),
-            'run': config.get('run', ''),
-            'uses': config.get('uses', ''),
-            'with': config.get('with', {}),
-            'env': config.get('env', {}),
-            'working_directory': config.get('working-directory', ''),
-            'shell': config.get('shell', 'bash'),
-            'condition': config.get('if', ''),
-            'continue_on_error': config.get('continue-on-error', False),
-            'timeout_minutes': config.get('timeout-minutes', 60),
+            'name': f'Step {index + 1}',
+            'id': '',
+            'run': '',
+            'uses': '',
+            'with': {},
+            'env': {},
+            'working_directory': '',
+            'shell': 'bash',
+            'condition': '',
+            'continue_on_error': False,
+            'timeout_minutes': 60,
         }
 
+        # One pass over the step's own keys instead of a lookup per field
+        step_keys = self._STEP_KEYS
+        for key, value in config.items():
+            field_name = step_keys.get(key)
+            if field_name is not None:
+                step[field_name] = value
+
         # Validate: must have either 'run' or 'uses'
         if not step['run'] and not step['uses']:
             self.errors.append(
@@ -362,84 +385,104 @@ class PipelineParser:
 
     def _normalize_runs_on(self, runs_on) -> list:
         """Normalize runs-on to a list."""
-        if isinstance(runs_on, str):
+        if type(runs_on) is str:
             return [runs_on]
-        if isinstance(runs_on, list):
+        if type(runs_on) is list:
             return runs_on
         return []
 
     def _normalize_list(self, value) -> list:
         """Normalize a value to a list."""
-        if isinstance(value, str):
+        if type(value) is str:
             return [value]
-        if isinstance(value, list):
+        if type(value) is list:
             return value
         return []
 
     def _validate_job_key(self, key: str) -> bool:
         """Validate job key format."""
-        # Job keys must start with a letter or underscore
-        # and contain only alphanumeric characters, underscores, or hyphens
-        pattern = r'^[a-zA-Z_][a-zA-Z0-9_-]*$'
-        return bool(re.match(pattern, key))
-
-    def _validate_job_dependencies(self, jobs: dict) -> None:
-        """Validate that all job dependencies exist."""
-        job_keys = set(jobs.keys())
-
-        for job_key, job in jobs.items():
-            for needed_job in job['needs']:
-                if needed_job not in job_keys:
-                    self.errors.append(
-                        f"Job '{job_key}' depends on non-existent job '{needed_job}'"
-                    )
-
-        # Check for circular dependencies
-        self._check_circular_dependencies(jobs)
+        return self._JOB_KEY_RE.fullmatch(key) is not None
 
     def _check_circular_dependencies(self, jobs: dict) -> None:
-        """Check for circular dependencies in job graph."""
-        visited = set()
-        rec_stack = set()
-
-        def has_cycle(job_key: str) -> bool:
-            visited.add(job_key)
-            rec_stack.add(job_key)
-
-            for dep in jobs.get(job_key, {}).get('needs', []):
-                if dep not in visited:
-                    if has_cycle(dep):
-                        return True
-                elif dep in rec_stack:
-                    return True
-
-            rec_stack.remove(job_key)
-            return False
-
-        for job_key in jobs:
-            if job_key not in visited:
-                if has_cycle(job_key):
-                    self.errors.append("Circular dependency detected in job graph")
-                    return
+        """
+        Check for circular dependencies in job graph.
+
+        Runs Kahn's topological sort without recursion: jobs whose needs
+        are all satisfied are peeled off until none are left. Any remaining
+        job sits on or behind a cycle, and following its unsatisfied needs
+        leads to one, which is named in the error.
+        """
+        # Needs on non-existent jobs are reported separately
+        needs = {
+            job_key: [dep for dep in job.get('needs', []) if dep in jobs]
+            for job_key, job in jobs.items()
+        }
+
+        pending = {job_key: len(deps) for job_key, deps in needs.items()}
+        dependents = {job_key: [] for job_key in jobs}
+        for job_key, deps in needs.items():
+            for dep in deps:
+                dependents[dep].append(job_key)
+
+        ready = deque(job_key for job_key, count in pending.items() if count == 0)
+        while ready:
+            job_key = ready.popleft()
+            del pending[job_key]
+            for dependent in dependents[job_key]:
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    ready.append(dependent)
+
+        if not pending:
+            return
+
+        # Every remaining job has a remaining need; walk them until a job repeats
+        path = []
+        seen = {}
+        job_key = next(iter(pending))
+        while job_key not in seen:
+            seen[job_key] = len(path)
+            path.append(job_key)
+            job_key = next(dep for dep in needs[job_key] if dep in pending)
+        cycle = path[seen[job_key]:] + [job_key]
+
+        self.errors.append(
+            f"Circular dependency detected in job graph: {' -> '.join(cycle)}"
+        )
 
     def _validate_cron(self, expression: str) -> bool:
         """Validate cron expression format."""
         # Basic validation: 5 or 6 fields
-        parts = expression.split()
-        if len(parts) not in (5, 6):
-            return False
-        return True
+        return self._CRON_FIELDS_RE.fullmatch(expression) is not None
 
 
 def parse_pipeline_yaml(yaml_content: str) -> tuple[dict, list[str]]:
     """
     Convenience function to parse pipeline YAML.
 
+    Results are cached by content, so re-parsing the same YAML (the same
+    commit seen again) only decodes the cached JSON. The parsed config is
+    returned in its JSON form, as PipelineConfig.parsed_config stores it,
+    and each call gets its own copy.
+
     Args:
         yaml_content: Raw YAML content
 
     Returns:
         tuple: (parsed_config, errors)
     """
+    try:
+        parsed_json, errors = _parse_pipeline_yaml_json(yaml_content)
+    except TypeError:
+        # Not JSON-serialisable (e.g. unsupported YAML types); parse uncached
+        parser = PipelineParser()
+        return parser.parse(yaml_content)
+    return orjson.loads(parsed_json), list(errors)
+
+
+@lru_cache(maxsize=256)
+def _parse_pipeline_yaml_json(yaml_content: str) -> tuple[bytes, tuple]:
+    """Parse pipeline YAML into (parsed config JSON, errors) for caching."""
     parser = PipelineParser()
-    return parser.parse(yaml_content)
+    parsed, errors = parser.parse(yaml_content)
+    return orjson.dumps(parsed, option=orjson.OPT_NON_STR_KEYS), tuple(errors)
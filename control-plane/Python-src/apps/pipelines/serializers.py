@@ -5,6 +5,9 @@ from rest_framework import serializers
 from apps.pipelines.models import Pipeline, PipelineConfig
 from apps.pipelines.parser import parse_pipeline_yaml
 
+# Formats datetimes exactly like a ModelSerializer's DateTimeField
+_datetime_field = serializers.DateTimeField()
+
 
 class PipelineConfigSerializer(serializers.ModelSerializer):
     """Serializer for pipeline configuration."""
@@ -19,6 +22,17 @@ class PipelineConfigSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'version', 'parsed_config', 'is_valid', 'validation_errors']
 
 
+class PipelineConfigSummarySerializer(serializers.ModelSerializer):
+    """List serializer for pipeline configuration (without the YAML)."""
+
+    class Meta:
+        model = PipelineConfig
+        fields = [
+            'id', 'version', 'commit_sha', 'commit_message',
+            'is_valid', 'validation_errors', 'created_at'
+        ]
+
+
 class PipelineSerializer(serializers.ModelSerializer):
     """Serializer for Pipeline model."""
     latest_config = serializers.SerializerMethodField()
@@ -37,11 +51,27 @@ class PipelineSerializer(serializers.ModelSerializer):
 
     def get_latest_config(self, obj):
         config = obj.get_latest_config()
-        if config:
-            return PipelineConfigSerializer(config).data
-        return None
+        if config is None:
+            return None
+
+        # Same output as PipelineConfigSerializer(config).data, without
+        # building and binding a serializer for every pipeline in a list
+        return {
+            'id': str(config.id),
+            'version': config.version,
+            'config_yaml': config.config_yaml,
+            'parsed_config': config.parsed_config,
+            'commit_sha': config.commit_sha,
+            'commit_message': config.commit_message,
+            'is_valid': config.is_valid,
+            'validation_errors': config.validation_errors,
+            'created_at': _datetime_field.to_representation(config.created_at),
+        }
 
     def get_execution_count(self, obj):
+        # Annotated by PipelineViewSet.get_queryset
+        if hasattr(obj, 'num_executions'):
+            return obj.num_executions
         return obj.executions.count()
 
 
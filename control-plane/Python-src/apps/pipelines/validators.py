@@ -2,7 +2,7 @@
 Pipeline YAML schema validation using JSON Schema.
 """
 import json
-from jsonschema import Draft7Validator, ValidationError
+from functools import lru_cache
 
 # JSON Schema for pipeline configuration
 PIPELINE_SCHEMA = {
@@ -218,11 +218,42 @@ PIPELINE_SCHEMA = {
 }
 
 
+@lru_cache(maxsize=None)
+def _compiled_validators():
+    """
+    Build the schema validators on first use.
+
+    The schema is fixed, so it is checked and its Draft7Validator built
+    once; the validator holds no per-validation state and is shared.
+    jsonschema (and fastjsonschema) are only imported here, keeping them
+    out of worker startup.
+
+    fastjsonschema stops at the first error with its own messages, so it
+    only decides whether a config is valid; invalid configs are re-checked
+    with the Draft7Validator to report every error in the usual format.
+    Defaults are not filled in, so the config is never modified.
+
+    Returns:
+        (Draft7Validator, fastjsonschema validate function or None)
+    """
+    from jsonschema import Draft7Validator
+
+    Draft7Validator.check_schema(PIPELINE_SCHEMA)
+    validator = Draft7Validator(PIPELINE_SCHEMA)
+
+    try:
+        # Optional: compiles the schema to plain Python for valid configs
+        import fastjsonschema
+    except ImportError:
+        return validator, None
+    return validator, fastjsonschema.compile(PIPELINE_SCHEMA, use_default=False)
+
+
 class SchemaValidator:
     """JSON Schema validator for pipeline configurations."""
 
     def __init__(self):
-        self.validator = Draft7Validator(PIPELINE_SCHEMA)
+        self.validator, self._fast_validate = _compiled_validators()
 
     def validate(self, config: dict) -> list[str]:
         """
@@ -231,6 +262,14 @@ class SchemaValidator:
         Returns:
             list of validation error messages
         """
+        if self._fast_validate is not None:
+            from fastjsonschema import JsonSchemaException
+            try:
+                self._fast_validate(config)
+                return []
+            except JsonSchemaException:
+                pass
+
         errors = []
 
         for error in self.validator.iter_errors(config):
@@ -242,6 +281,15 @@ class SchemaValidator:
 
         return errors
 
+    def validate_many(self, configs) -> list[list[str]]:
+        """
+        Validate several configurations with the same compiled validator.
+
+        Returns:
+            list of validation error message lists, one per configuration
+        """
+        return [self.validate(config) for config in configs]
+
 
 def validate_pipeline_schema(config: dict) -> list[str]:
     """
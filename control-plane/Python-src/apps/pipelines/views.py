@@ -3,8 +3,10 @@ Pipeline API views
 """
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
-from django.utils import timezone
+from django.db import transaction
+from django.db.models import Count
 from django.utils.text import slugify
 
 from apps.pipelines.models import Pipeline, PipelineConfig
@@ -12,6 +14,7 @@ from apps.pipelines.serializers import (
     PipelineSerializer,
     PipelineCreateSerializer,
     PipelineConfigSerializer,
+    PipelineConfigSummarySerializer,
     PipelineTriggerSerializer,
 )
 from apps.pipelines.parser import parse_pipeline_yaml
@@ -30,12 +33,22 @@ class PipelineViewSet(viewsets.ModelViewSet):
     destroy: Delete a pipeline
     trigger: Manually trigger a pipeline execution
     configs: Get configuration versions for a pipeline
+    config_version: Get one configuration version with its YAML
     """
     serializer_class = PipelineSerializer
     lookup_field = 'id'
 
+    # Actions whose responses are rendered by PipelineSerializer
+    SUMMARY_ACTIONS = ('list', 'retrieve', 'update', 'partial_update')
+
     def get_queryset(self):
-        return Pipeline.objects.filter(tenant=self.request.tenant)
+        queryset = Pipeline.objects.filter(tenant=self.request.tenant)
+        if self.action in self.SUMMARY_ACTIONS:
+            # One COUNT join and one prefetch query instead of two per pipeline
+            queryset = queryset.annotate(
+                num_executions=Count('executions')
+            ).prefetch_related(Pipeline.prefetch_latest_config())
+        return queryset
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -75,25 +88,22 @@ class PipelineViewSet(viewsets.ModelViewSet):
             )
 
         # Create execution
-        execution = Execution.objects.create(
-            tenant=request.tenant,
-            pipeline=pipeline,
-            pipeline_config=config,
-            number=Execution.objects.filter(pipeline=pipeline).count() + 1,
-            trigger_type=Execution.TriggerType.MANUAL,
-            trigger_info={
-                'user_id': str(request.user.id),
-                'username': request.user.username,
-                'branch': serializer.validated_data.get('branch', 'main'),
-            },
-            inputs=serializer.validated_data.get('inputs', {}),
-            environment=serializer.validated_data.get('environment', {}),
-            triggered_by=request.user,
-        )
-
-        # Update pipeline last execution time
-        pipeline.last_execution_at = timezone.now()
-        pipeline.save(update_fields=['last_execution_at'])
+        with transaction.atomic():
+            execution = Execution.objects.create(
+                tenant=request.tenant,
+                pipeline=pipeline,
+                pipeline_config=config,
+                number=Execution.allocate_number(pipeline.id),
+                trigger_type=Execution.TriggerType.MANUAL,
+                trigger_info={
+                    'user_id': str(request.user.id),
+                    'username': request.user.username,
+                    'branch': serializer.validated_data.get('branch', 'main'),
+                },
+                inputs=serializer.validated_data.get('inputs', {}),
+                environment=serializer.validated_data.get('environment', {}),
+                triggered_by=request.user,
+            )
 
         # TODO: Queue execution for processing
 
@@ -105,10 +115,20 @@ class PipelineViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['get'])
     def configs(self, request, id=None):
-        """Get configuration versions for a pipeline."""
+        """Get configuration versions for a pipeline, without their YAML."""
+        pipeline = self.get_object()
+        configs = pipeline.configs.defer(
+            'config_yaml', 'parsed_config', 'compiled_triggers'
+        )[:20]  # Last 20 versions
+        serializer = PipelineConfigSummarySerializer(configs, many=True)
+        return Response(serializer.data)
+
+    @action(detail=True, methods=['get'], url_path=r'configs/(?P<version>\d+)')
+    def config_version(self, request, id=None, version=None):
+        """Get one configuration version, including its YAML."""
         pipeline = self.get_object()
-        configs = pipeline.configs.all()[:20]  # Last 20 versions
-        serializer = PipelineConfigSerializer(configs, many=True)
+        config = get_object_or_404(pipeline.configs, version=version)
+        serializer = PipelineConfigSerializer(config)
         return Response(serializer.data)
 
     @action(detail=True, methods=['post'])
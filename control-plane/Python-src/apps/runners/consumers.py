@@ -3,12 +3,21 @@ Runner WebSocket consumer for Muelsyse-CI
 
 Handles bidirectional communication between runners and control plane.
 """
-import json
+import asyncio
 import hashlib
+import logging
+import time
+import uuid
+from collections import Counter, deque
+from urllib.parse import parse_qs
+import orjson
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.utils import timezone
 from asgiref.sync import sync_to_async
+from django.utils.dateparse import parse_datetime
+
+logger = logging.getLogger(__name__)
 
 
 class RunnerConsumer(AsyncWebsocketConsumer):
@@ -19,13 +28,48 @@ class RunnerConsumer(AsyncWebsocketConsumer):
     - Runner connects with token in query string
     - Runner sends heartbeats and job status updates
     - Control plane sends job assignments and cancellations
+
+    Runners that connect with ?frames=binary are sent their JSON messages as
+    binary frames, which skips a str decode/encode round trip per frame.
+
+    Log lines are coalesced for up to LOG_FLUSH_DELAY seconds or
+    LOG_BATCH_SIZE lines, then stored with one bulk write and broadcast as
+    one 'log_batch' event per job and execution group.
     """
 
+    LOG_FLUSH_DELAY = 0.02
+    LOG_BATCH_SIZE = 64
+
+    # Heartbeats reporting nothing new are written at most this often, well
+    # inside Runner.check_offline()'s 90 second threshold
+    HEARTBEAT_WRITE_INTERVAL = 15
+
+    # Incoming message type -> handler method name
+    _HANDLERS = {
+        'heartbeat': 'handle_heartbeat',
+        'log': 'handle_log',
+        'status_update': 'handle_status_update',
+        'job_complete': 'handle_job_complete',
+        'artifact_ready': 'handle_artifact_ready',
+    }
+
     async def connect(self):
         self.runner_id = self.scope['url_route']['kwargs']['runner_id']
         self.runner = None
+        self.binary_frames = False
         self.group_name = f'runner_{self.runner_id}'
 
+        self._log_queue = deque()
+        self._log_flush_handle = None
+        self._log_flush_task = None
+        self._log_flush_lock = asyncio.Lock()
+
+        # Last (system_info, current_jobs) written and when; jobs completed
+        # since then are settled by the next heartbeat's current_jobs
+        self._heartbeat_state = None
+        self._heartbeat_written_at = 0.0
+        self._pending_job_decrements = 0
+
         # Authenticate runner
         if not await self.authenticate():
             await self.close()
@@ -48,14 +92,18 @@ class RunnerConsumer(AsyncWebsocketConsumer):
 
         # Mark runner as online
         await self.set_runner_online()
+        self._heartbeat_written_at = time.monotonic()
 
         # Send connection confirmation
-        await self.send(text_data=json.dumps({
+        await self.send_message({
             'type': 'connected',
             'runner_id': self.runner_id,
-        }))
+        })
 
     async def disconnect(self, close_code):
+        # Store and broadcast any log lines still waiting for a flush
+        await self.flush_logs()
+
         # Mark runner as offline
         await self.set_runner_offline()
 
@@ -71,50 +119,49 @@ class RunnerConsumer(AsyncWebsocketConsumer):
                 self.channel_name
             )
 
-    async def receive(self, text_data):
-        """Handle incoming messages from runner."""
+    async def receive(self, text_data=None, bytes_data=None):
+        """Handle incoming messages from runner (text or binary JSON frames)."""
         try:
-            data = json.loads(text_data)
-            message_type = data.get('type')
-
-            handlers = {
-                'heartbeat': self.handle_heartbeat,
-                'log': self.handle_log,
-                'status_update': self.handle_status_update,
-                'job_complete': self.handle_job_complete,
-                'artifact_ready': self.handle_artifact_ready,
-            }
-
-            handler = handlers.get(message_type)
-            if handler:
-                await handler(data)
-            else:
-                await self.send(text_data=json.dumps({
-                    'type': 'error',
-                    'message': f'Unknown message type: {message_type}'
-                }))
-
-        except json.JSONDecodeError:
-            await self.send(text_data=json.dumps({
+            data = orjson.loads(text_data if text_data is not None else bytes_data)
+        except orjson.JSONDecodeError:
+            await self.send_message({
                 'type': 'error',
                 'message': 'Invalid JSON'
-            }))
+            })
+            return
+
+        message_type = data.get('type')
+        handler_name = self._HANDLERS.get(message_type)
+        if handler_name:
+            await getattr(self, handler_name)(data)
+        else:
+            await self.send_message({
+                'type': 'error',
+                'message': f'Unknown message type: {message_type}'
+            })
+
+    async def send_message(self, message):
+        """Send a JSON message to the runner in its negotiated frame type."""
+        if self.binary_frames:
+            await self.send(bytes_data=orjson.dumps(message))
+        else:
+            await self.send(text_data=orjson.dumps(message).decode())
 
     # Outgoing message handlers (from control plane to runner)
 
     async def job_assignment(self, event):
         """Send job assignment to runner."""
-        await self.send(text_data=json.dumps({
+        await self.send_message({
             'type': 'job_assignment',
             'job': event['job'],
-        }))
+        })
 
     async def job_cancel(self, event):
         """Send job cancellation to runner."""
-        await self.send(text_data=json.dumps({
+        await self.send_message({
             'type': 'job_cancel',
             'job_id': event['job_id'],
-        }))
+        })
 
     # Incoming message handlers (from runner to control plane)
 
@@ -123,59 +170,91 @@ class RunnerConsumer(AsyncWebsocketConsumer):
         system_info = data.get('system_info', {})
         current_jobs = data.get('current_jobs', 0)
 
-        await self.update_runner_heartbeat(system_info, current_jobs)
-
-        await self.send(text_data=json.dumps({
+        # The runner's own job count supersedes completions seen since
+        self._pending_job_decrements = 0
+
+        state = (system_info, current_jobs)
+        now = time.monotonic()
+        if (
+            state != self._heartbeat_state
+            or now - self._heartbeat_written_at >= self.HEARTBEAT_WRITE_INTERVAL
+        ):
+            await self.update_runner_heartbeat(system_info, current_jobs)
+            self._heartbeat_state = state
+            self._heartbeat_written_at = now
+
+        # orjson writes aware datetimes in isoformat() form itself
+        await self.send_message({
             'type': 'heartbeat_ack',
-            'timestamp': timezone.now().isoformat(),
-        }))
+            'timestamp': timezone.now(),
+        })
 
     async def handle_log(self, data):
-        """Handle log message from runner."""
-        from channels.layers import get_channel_layer
-
-        job_id = data.get('job_id')
-        step_id = data.get('step_id')
-        content = data.get('content')
-        level = data.get('level', 'info')
-        timestamp = data.get('timestamp', timezone.now().isoformat())
-
-        # Store log
-        await self.store_log(step_id, content, level, timestamp)
-
-        # Broadcast to log subscribers
-        channel_layer = get_channel_layer()
-
-        # Get execution_id for the job
-        execution_id = await self.get_execution_id(job_id)
-
-        # Send to job-specific group
-        await channel_layer.group_send(
-            f'logs_job_{job_id}',
-            {
-                'type': 'log_message',
-                'job_id': job_id,
-                'step_id': step_id,
-                'content': content,
-                'level': level,
-                'timestamp': timestamp,
-            }
-        )
+        """Queue a log message from runner for the next batched flush."""
+        self._log_queue.append({
+            'type': 'log',
+            'job_id': data.get('job_id'),
+            'step_id': data.get('step_id'),
+            'content': data.get('content'),
+            'level': data.get('level', 'info'),
+            'timestamp': data.get('timestamp') or timezone.now().isoformat(),
+        })
+
+        if len(self._log_queue) >= self.LOG_BATCH_SIZE:
+            await self.flush_logs()
+        elif self._log_flush_handle is None:
+            self._log_flush_handle = asyncio.get_running_loop().call_later(
+                self.LOG_FLUSH_DELAY, self._start_log_flush
+            )
 
-        # Send to execution group
-        if execution_id:
-            await channel_layer.group_send(
-                f'logs_execution_{execution_id}',
-                {
-                    'type': 'log_message',
-                    'job_id': job_id,
-                    'step_id': step_id,
-                    'content': content,
-                    'level': level,
-                    'timestamp': timestamp,
-                }
+    def _start_log_flush(self):
+        self._log_flush_handle = None
+        self._log_flush_task = asyncio.ensure_future(self.flush_logs())
+        self._log_flush_task.add_done_callback(self._log_flush_done)
+
+    def _log_flush_done(self, task):
+        # Nothing awaits a scheduled flush, so report its failure here
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(
+                'Failed to flush logs for runner %s', self.runner_id,
+                exc_info=task.exception()
             )
 
+    async def flush_logs(self):
+        """Store queued log lines and broadcast them to log subscribers."""
+        if self._log_flush_handle is not None:
+            self._log_flush_handle.cancel()
+            self._log_flush_handle = None
+
+        # Flushes run one at a time so chunk numbers follow arrival order
+        async with self._log_flush_lock:
+            if not self._log_queue:
+                return
+            entries = list(self._log_queue)
+            self._log_queue.clear()
+
+            execution_ids = await self.store_logs(entries)
+
+            by_job = {}
+            by_execution = {}
+            for entry in entries:
+                by_job.setdefault(entry['job_id'], []).append(entry)
+                execution_id = execution_ids.get(entry['job_id'])
+                if execution_id:
+                    by_execution.setdefault(execution_id, []).append(entry)
+
+            for job_id, job_entries in by_job.items():
+                await self.channel_layer.group_send(
+                    f'logs_job_{job_id}',
+                    {'type': 'log_batch', 'entries': job_entries}
+                )
+
+            for execution_id, execution_entries in by_execution.items():
+                await self.channel_layer.group_send(
+                    f'logs_execution_{execution_id}',
+                    {'type': 'log_batch', 'entries': execution_entries}
+                )
+
     async def handle_status_update(self, data):
         """Handle status update from runner."""
         entity_type = data.get('entity_type')  # 'job' or 'step'
@@ -184,18 +263,18 @@ class RunnerConsumer(AsyncWebsocketConsumer):
         exit_code = data.get('exit_code')
         outputs = data.get('outputs', {})
 
+        # Subscribers should see a step's logs before its status change
+        await self.flush_logs()
+
         await self.update_entity_status(
             entity_type, entity_id, new_status, exit_code, outputs
         )
 
         # Broadcast status update
-        from channels.layers import get_channel_layer
-        channel_layer = get_channel_layer()
-
         if entity_type == 'job':
             execution_id = await self.get_execution_id(entity_id)
             if execution_id:
-                await channel_layer.group_send(
+                await self.channel_layer.group_send(
                     f'logs_execution_{execution_id}',
                     {
                         'type': 'status_update',
@@ -212,10 +291,12 @@ class RunnerConsumer(AsyncWebsocketConsumer):
         status = data.get('status')
         outputs = data.get('outputs', {})
 
+        await self.flush_logs()
+
         await self.complete_job(job_id, status, outputs)
 
-        # Decrement current jobs count
-        await self.decrement_runner_jobs()
+        # Counted down by the next heartbeat, or on disconnect
+        self._pending_job_decrements += 1
 
     async def handle_artifact_ready(self, data):
         """Handle artifact upload notification from runner."""
@@ -236,19 +317,23 @@ class RunnerConsumer(AsyncWebsocketConsumer):
         """Authenticate runner using token from query string."""
         from apps.runners.models import Runner
 
-        query_string = self.scope.get('query_string', b'').decode()
-        params = dict(p.split('=') for p in query_string.split('&') if '=' in p)
-        token = params.get('token', '')
+        query_string = self.scope.get('query_string', b'').decode('ascii', 'replace')
+        try:
+            params = parse_qs(query_string, max_num_fields=8)
+        except ValueError:
+            return False
+        token = params.get('token', [''])[0]
+        self.binary_frames = params.get('frames', [''])[0] == 'binary'
 
         if not token:
             return False
 
-        token_hash = hashlib.sha256(token.encode()).hexdigest()
+        token_hash = hashlib.sha256(token.encode()).digest()
 
         try:
             self.runner = Runner.objects.get(
                 id=self.runner_id,
-                token_hash=token_hash
+                token_hash_bin=token_hash
             )
             return True
         except Runner.DoesNotExist:
@@ -265,9 +350,12 @@ class RunnerConsumer(AsyncWebsocketConsumer):
     @database_sync_to_async
     def set_runner_offline(self):
         from apps.runners.models import Runner
-        Runner.objects.filter(id=self.runner_id).update(
-            status=Runner.Status.OFFLINE
-        )
+        from django.db.models import F
+        update_fields = {'status': Runner.Status.OFFLINE}
+        if self._pending_job_decrements:
+            update_fields['current_jobs'] = F('current_jobs') - self._pending_job_decrements
+            self._pending_job_decrements = 0
+        Runner.objects.filter(id=self.runner_id).update(**update_fields)
 
     @database_sync_to_async
     def update_runner_heartbeat(self, system_info, current_jobs):
@@ -279,25 +367,73 @@ class RunnerConsumer(AsyncWebsocketConsumer):
         )
 
     @database_sync_to_async
-    def store_log(self, step_id, content, level, timestamp):
-        from apps.logs.models import LogChunk
-        from apps.executions.models import Step
-        from django.utils.dateparse import parse_datetime
+    def store_logs(self, entries):
+        """
+        Store a batch of log lines and look up their jobs' executions.
+
+        Lines for unknown steps are dropped. Each step's lines get chunk
+        numbers reserved from its log_chunk_seq counter, in arrival order.
+
+        Returns:
+            dict mapping each known job_id to its execution_id
+        """
+        from apps.logs.models import LogBuffer
+        from apps.executions.models import Job, Step
+        from django.db import transaction
+
+        steps = {
+            str(step_id): (job_id, order)
+            for step_id, job_id, order in Step.objects.filter(
+                id__in=_uuid_keys(entry['step_id'] for entry in entries)
+            ).values_list('id', 'job_id', 'order')
+        }
+
+        lines = []
+        for entry in entries:
+            step_key = _uuid_key(entry['step_id'])
+            if step_key in steps:
+                lines.append((step_key, entry))
+
+        if lines:
+            with transaction.atomic():
+                next_chunk = Step.reserve_log_chunks(
+                    Counter(step_key for step_key, _ in lines)
+                )
 
-        try:
-            step = Step.objects.get(id=step_id)
-            last_chunk = step.log_chunks.order_by('-chunk_number').first()
-            next_chunk = (last_chunk.chunk_number + 1) if last_chunk else 0
-
-            LogChunk.objects.create(
-                step=step,
-                chunk_number=next_chunk,
-                content=content,
-                level=level,
-                timestamp=parse_datetime(timestamp) or timezone.now()
-            )
-        except Step.DoesNotExist:
-            pass
+                rows = []
+                for step_key, entry in lines:
+                    if step_key not in next_chunk:
+                        # Step deleted since it was looked up
+                        continue
+                    chunk_number = next_chunk[step_key]
+                    next_chunk[step_key] = chunk_number + 1
+                    job_id, step_order = steps[step_key]
+                    rows.append({
+                        'step_id': step_key,
+                        'job_id': job_id,
+                        'step_order': step_order,
+                        'chunk_number': chunk_number,
+                        'content': _log_content(entry['content']),
+                        'level': _log_level(entry['level']),
+                        'timestamp': _log_timestamp(entry['timestamp']),
+                    })
+
+                LogBuffer().write(rows)
+
+        job_keys = {
+            entry['job_id']: _uuid_key(entry['job_id']) for entry in entries
+        }
+        executions = {
+            str(job_id): str(execution_id)
+            for job_id, execution_id in Job.objects.filter(
+                id__in=[key for key in job_keys.values() if key]
+            ).values_list('id', 'execution_id')
+        }
+        return {
+            job_id: executions[key]
+            for job_id, key in job_keys.items()
+            if key in executions
+        }
 
     @database_sync_to_async
     def get_execution_id(self, job_id):
@@ -341,24 +477,16 @@ class RunnerConsumer(AsyncWebsocketConsumer):
             outputs=outputs
         )
 
-    @database_sync_to_async
-    def decrement_runner_jobs(self):
-        from apps.runners.models import Runner
-        from django.db.models import F
-        Runner.objects.filter(id=self.runner_id).update(
-            current_jobs=F('current_jobs') - 1
-        )
-
     @database_sync_to_async
     def create_artifact(self, job_id, name, path, size_bytes, checksum):
         from apps.artifacts.models import Artifact
         from apps.executions.models import Job
 
         try:
-            job = Job.objects.select_related('execution').get(id=job_id)
+            job = Job.objects.only('id', 'execution_id', 'tenant_id').get(id=job_id)
             Artifact.objects.create(
-                tenant=job.execution.tenant,
-                execution=job.execution,
+                tenant_id=job.tenant_id,
+                execution_id=job.execution_id,
                 job=job,
                 name=name,
                 storage_path=path,
@@ -367,3 +495,39 @@ class RunnerConsumer(AsyncWebsocketConsumer):
             )
         except Job.DoesNotExist:
             pass
+
+
+def _uuid_key(value):
+    """Canonical string form of a UUID sent by a runner, or None if invalid."""
+    try:
+        return str(uuid.UUID(str(value)))
+    except ValueError:
+        return None
+
+
+def _uuid_keys(values):
+    """Canonical forms of the valid UUIDs among values."""
+    return {key for key in map(_uuid_key, values) if key}
+
+
+# Coercions for runner-sent log fields, so one malformed line cannot fail
+# the write of the whole batch it was flushed with
+
+def _log_content(value) -> str:
+    if isinstance(value, str):
+        return value
+    return '' if value is None else str(value)
+
+
+def _log_level(value) -> str:
+    from apps.logs.models import LogChunk
+    if value in LogChunk.Level.values:
+        return value
+    return LogChunk.Level.INFO
+
+
+def _log_timestamp(value):
+    try:
+        return parse_datetime(value) or timezone.now()
+    except (TypeError, ValueError):
+        return timezone.now()
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-16 01:40
+
+from django.db import migrations, models
+
+
+def backfill_token_hash_bin(apps, schema_editor):
+    Runner = apps.get_model('runners', 'Runner')
+    for runner in Runner.objects.only('id', 'token_hash').iterator():
+        Runner.objects.filter(pk=runner.pk).update(
+            token_hash_bin=bytes.fromhex(runner.token_hash)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('runners', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='runner',
+            name='token_hash_bin',
+            field=models.BinaryField(editable=False, max_length=32, null=True),
+        ),
+        migrations.RunPython(backfill_token_hash_bin, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='runner',
+            name='token_hash_bin',
+            field=models.BinaryField(editable=False, max_length=32, unique=True),
+        ),
+    ]
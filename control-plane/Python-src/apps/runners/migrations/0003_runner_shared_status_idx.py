@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 01:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('runners', '0002_runner_token_hash_bin'),
+        ('tenants', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='runner',
+            index=models.Index(condition=models.Q(('runner_type', 'shared')), fields=['status'], name='runner_shared_status_idx'),
+        ),
+    ]
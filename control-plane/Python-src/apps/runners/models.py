@@ -46,7 +46,8 @@ class Runner(models.Model):
     description = models.TextField(blank=True)
 
     # Authentication
-    token_hash = models.CharField(max_length=128, unique=True)
+    token_hash = models.CharField(max_length=128, unique=True)  # SHA-256 hash (hex)
+    token_hash_bin = models.BinaryField(max_length=32, unique=True, editable=False)  # SHA-256 digest
 
     # Runner type
     runner_type = models.CharField(
@@ -95,11 +96,26 @@ class Runner(models.Model):
         indexes = [
             models.Index(fields=['status', 'runner_type']),
             models.Index(fields=['tenant', 'status']),
+            # Shared branch of the tenant-or-shared runner listing
+            models.Index(
+                fields=['status'],
+                condition=models.Q(runner_type='shared'),
+                name='runner_shared_status_idx',
+            ),
         ]
 
     def __str__(self):
         return f"{self.name} ({self.status})"
 
+    def save(self, *args, **kwargs):
+        # Lookups go through the binary digest; keep it in sync with token_hash
+        if self.token_hash:
+            self.token_hash_bin = bytes.fromhex(self.token_hash)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'token_hash' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'token_hash_bin'}
+        super().save(*args, **kwargs)
+
     @classmethod
     def generate_token(cls) -> tuple[str, str]:
         """Generate a new runner token and return (raw_token, hash)."""
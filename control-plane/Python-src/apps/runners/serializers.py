@@ -25,6 +25,13 @@ class RunnerSerializer(serializers.ModelSerializer):
         ]
 
 
+class RunnerListSerializer(RunnerSerializer):
+    """List serializer for Runner (without system_info)."""
+
+    class Meta(RunnerSerializer.Meta):
+        fields = [f for f in RunnerSerializer.Meta.fields if f != 'system_info']
+
+
 class RunnerCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating runners."""
 
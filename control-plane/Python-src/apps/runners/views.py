@@ -1,6 +1,7 @@
 """
 Runner API views
 """
+from django.db.models import Q
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -8,6 +9,7 @@ from rest_framework.response import Response
 from apps.runners.models import Runner
 from apps.runners.serializers import (
     RunnerSerializer,
+    RunnerListSerializer,
     RunnerCreateSerializer,
     RunnerTokenSerializer,
 )
@@ -19,6 +21,7 @@ class RunnerViewSet(viewsets.ModelViewSet):
     API endpoint for runner management.
 
     list: Get all runners for the current tenant
+          (system_info only with ?include_system_info=true)
     create: Register a new runner
     retrieve: Get a specific runner
     update: Update runner settings
@@ -34,9 +37,8 @@ class RunnerViewSet(viewsets.ModelViewSet):
         # In SaaS mode, filter by tenant (include shared runners)
         if self.request.tenant:
             queryset = queryset.filter(
-                tenant=self.request.tenant
-            ) | queryset.filter(
-                runner_type=Runner.RunnerType.SHARED
+                Q(tenant=self.request.tenant) |
+                Q(runner_type=Runner.RunnerType.SHARED)
             )
 
         # Filter by status
@@ -49,13 +51,23 @@ class RunnerViewSet(viewsets.ModelViewSet):
         if label:
             queryset = queryset.filter(labels__contains=[label])
 
+        # system_info can be large; lists only load it when asked for
+        if self._lists_without_system_info():
+            queryset = queryset.defer('system_info')
+
         return queryset
 
     def get_serializer_class(self):
         if self.action == 'create':
             return RunnerCreateSerializer
+        if self._lists_without_system_info():
+            return RunnerListSerializer
         return RunnerSerializer
 
+    def _lists_without_system_info(self) -> bool:
+        include = self.request.query_params.get('include_system_info', 'false')
+        return self.action == 'list' and include.lower() != 'true'
+
     @action(detail=False, methods=['post'], permission_classes=[IsOwnerOrAdmin])
     def generate_token(self, request):
         """
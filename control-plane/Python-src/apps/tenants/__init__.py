@@ -1,7 +1,5 @@
-from django.apps import AppConfig
+"""
+Tenants application for Muelsyse-CI
 
-
-class TenantsConfig(AppConfig):
-    default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.tenants'
-    verbose_name = 'Tenants'
+This module handles tenants and their quotas for multi-tenant isolation.
+"""
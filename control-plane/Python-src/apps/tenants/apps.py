@@ -0,0 +1,15 @@
+"""
+Tenants Django app configuration
+"""
+from django.apps import AppConfig
+
+
+class TenantsConfig(AppConfig):
+    """Configuration for the tenants application."""
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.tenants'
+    verbose_name = 'Tenants'
+
+    def ready(self):
+        # Register cache invalidation handlers
+        from apps.tenants import signals  # noqa: F401
@@ -2,8 +2,12 @@
 Tenant models for multi-tenancy support.
 """
 import uuid
+from django.core.cache import cache
 from django.db import models
 
+# How long a tenant resolved by slug stays in the cache (seconds)
+TENANT_CACHE_TIMEOUT = 300
+
 
 class Tenant(models.Model):
     """
@@ -50,6 +54,68 @@ class Tenant(models.Model):
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Snapshot the stored slug (unless deferred) so a rename can drop
+        # the old slug's cache entry
+        instance._loaded_slug = instance.__dict__.get('slug')
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+
+        # The signal handler only drops the entry for the current slug
+        loaded_slug = getattr(self, '_loaded_slug', None)
+        if loaded_slug and loaded_slug != self.slug:
+            cache.delete(self.get_cache_key(loaded_slug))
+        self._loaded_slug = self.slug
+
+    @staticmethod
+    def get_cache_key(slug: str) -> str:
+        """Cache key under which a tenant resolved by slug is stored."""
+        return f"tenant:slug:{slug}"
+
+    @classmethod
+    def get_by_slug_cached(cls, slug: str):
+        """
+        Get a tenant by slug, or None if it does not exist.
+
+        Results are cached for TENANT_CACHE_TIMEOUT seconds; see
+        apps.tenants.signals for invalidation.
+        """
+        cache_key = cls.get_cache_key(slug)
+        tenant = cache.get(cache_key)
+        if tenant is None:
+            try:
+                tenant = cls.objects.get(slug=slug)
+            except cls.DoesNotExist:
+                return None
+            cache.set(cache_key, tenant, timeout=TENANT_CACHE_TIMEOUT)
+        return tenant
+
+    @staticmethod
+    def get_id_cache_key(tenant_id) -> str:
+        """Cache key under which a tenant resolved by id is stored."""
+        return f"tenant:id:{tenant_id}"
+
+    @classmethod
+    def get_by_id_cached(cls, tenant_id):
+        """
+        Get a tenant by id, or None if it does not exist.
+
+        Cached like get_by_slug_cached().
+        """
+        cache_key = cls.get_id_cache_key(tenant_id)
+        tenant = cache.get(cache_key)
+        if tenant is None:
+            try:
+                tenant = cls.objects.get(pk=tenant_id)
+            except cls.DoesNotExist:
+                return None
+            cache.set(cache_key, tenant, timeout=TENANT_CACHE_TIMEOUT)
+        return tenant
+
     @property
     def is_self_hosted(self) -> bool:
         return self.plan == self.Plan.SELF_HOSTED
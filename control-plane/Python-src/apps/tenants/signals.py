@@ -0,0 +1,18 @@
+"""
+Signal handlers for tenants.
+"""
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.tenants.models import Tenant
+
+
+@receiver(post_save, sender=Tenant)
+@receiver(post_delete, sender=Tenant)
+def invalidate_tenant_cache(sender, instance, **kwargs):
+    """Drop the cached tenant so changes take effect immediately."""
+    cache.delete_many([
+        Tenant.get_cache_key(instance.slug),
+        Tenant.get_id_cache_key(instance.pk),
+    ])
@@ -6,6 +6,7 @@ GitHub webhook payloads for different event types.
 """
 import logging
 from dataclasses import dataclass, field
+from functools import cached_property
 from typing import Optional, Any
 
 logger = logging.getLogger(__name__)
@@ -138,9 +139,14 @@ class PushEvent:
         """Get the head commit SHA."""
         return self.after
 
-    @property
-    def changed_files(self) -> list:
-        """Get list of all changed files in the push."""
+    @cached_property
+    def changed_files(self) -> tuple:
+        """
+        Get all changed files in the push.
+
+        Computed once per event and returned as a tuple, since every
+        pipeline matcher shares the cached value.
+        """
         files = set()
         for commit in self.commits:
             if isinstance(commit, GitHubCommit):
@@ -151,7 +157,7 @@ class PushEvent:
                 files.update(commit.get('added', []))
                 files.update(commit.get('removed', []))
                 files.update(commit.get('modified', []))
-        return list(files)
+        return tuple(files)
 
 
 @dataclass
@@ -221,9 +227,9 @@ class PullRequestEvent:
         return self.head_repo != self.base_repo
 
     @property
-    def changed_files(self) -> list:
-        """Get list of changed files (if available in payload)."""
-        return []  # Note: PR payloads don't include file list, need API call
+    def changed_files(self) -> tuple:
+        """Get changed files (if available in payload)."""
+        return ()  # Note: PR payloads don't include file list, need API call
 
 
 class GitHubEventParser:
@@ -7,8 +7,8 @@ import json
 import logging
 from typing import Optional
 
+from django.db import transaction
 from django.http import HttpRequest
-from django.utils import timezone
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
@@ -25,7 +25,6 @@ from apps.webhooks.parsers import (
     PullRequestEvent,
 )
 from apps.pipelines.models import Pipeline
-from apps.pipelines.matcher import PipelineMatcher
 from apps.executions.models import Execution
 
 logger = logging.getLogger(__name__)
@@ -261,7 +260,7 @@ class GitHubWebhookView(APIView):
                 continue
 
             # Check if event matches pipeline triggers
-            matcher = PipelineMatcher(config.parsed_config)
+            matcher = config.compiled_matcher
 
             if event_type == 'push' and isinstance(parsed_event, PushEvent):
                 if not matcher.matches_push(parsed_event):
@@ -308,11 +307,6 @@ class GitHubWebhookView(APIView):
             logger.info(f"Skipping execution for deleted branch: {event.branch}")
             return None
 
-        # Get next execution number
-        last_number = Execution.objects.filter(
-            pipeline=pipeline
-        ).order_by('-number').values_list('number', flat=True).first() or 0
-
         trigger_info = {
             'event_type': 'push',
             'delivery_id': delivery_id,
@@ -327,19 +321,16 @@ class GitHubWebhookView(APIView):
             'sender': event.sender.login if event.sender else '',
         }
 
-        execution = Execution.objects.create(
-            tenant=pipeline.tenant,
-            pipeline=pipeline,
-            pipeline_config=config,
-            number=last_number + 1,
-            trigger_type=Execution.TriggerType.PUSH,
-            trigger_info=trigger_info,
-            status=Execution.Status.PENDING,
-        )
-
-        # Update pipeline last execution time
-        pipeline.last_execution_at = timezone.now()
-        pipeline.save(update_fields=['last_execution_at'])
+        with transaction.atomic():
+            execution = Execution.objects.create(
+                tenant=pipeline.tenant,
+                pipeline=pipeline,
+                pipeline_config=config,
+                number=Execution.allocate_number(pipeline.id),
+                trigger_type=Execution.TriggerType.PUSH,
+                trigger_info=trigger_info,
+                status=Execution.Status.PENDING,
+            )
 
         # TODO: Queue execution for processing (Celery task)
 
@@ -353,11 +344,6 @@ class GitHubWebhookView(APIView):
         delivery_id: str
     ) -> Optional[Execution]:
         """Create an execution for a pull_request event."""
-        # Get next execution number
-        last_number = Execution.objects.filter(
-            pipeline=pipeline
-        ).order_by('-number').values_list('number', flat=True).first() or 0
-
         trigger_info = {
             'event_type': 'pull_request',
             'delivery_id': delivery_id,
@@ -374,19 +360,16 @@ class GitHubWebhookView(APIView):
             'sender': event.sender.login if event.sender else '',
         }
 
-        execution = Execution.objects.create(
-            tenant=pipeline.tenant,
-            pipeline=pipeline,
-            pipeline_config=config,
-            number=last_number + 1,
-            trigger_type=Execution.TriggerType.PULL_REQUEST,
-            trigger_info=trigger_info,
-            status=Execution.Status.PENDING,
-        )
-
-        # Update pipeline last execution time
-        pipeline.last_execution_at = timezone.now()
-        pipeline.save(update_fields=['last_execution_at'])
+        with transaction.atomic():
+            execution = Execution.objects.create(
+                tenant=pipeline.tenant,
+                pipeline=pipeline,
+                pipeline_config=config,
+                number=Execution.allocate_number(pipeline.id),
+                trigger_type=Execution.TriggerType.PULL_REQUEST,
+                trigger_info=trigger_info,
+                status=Execution.Status.PENDING,
+            )
 
         # TODO: Queue execution for processing (Celery task)
 
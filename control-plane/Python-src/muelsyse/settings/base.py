@@ -97,6 +97,14 @@ DATABASES = {
         'PASSWORD': env.str('DB_PASSWORD', ''),
         'HOST': env.str('DB_HOST', 'localhost'),
         'PORT': env.int('DB_PORT', 5432),
+        # Persistent connections keep psycopg's prepared statements across requests
+        'CONN_MAX_AGE': env.int('DB_CONN_MAX_AGE', 60),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # Prepare hot queries (e.g. the API key lookup) on first use.
+            # Disable when running behind pgbouncer in transaction mode.
+            'prepare_threshold': 1 if env.bool('DB_PREPARED_STATEMENTS', True) else None,
+        },
     }
 }
 
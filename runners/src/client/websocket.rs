@@ -370,7 +370,7 @@ impl WebSocketClient {
             Self::set_state(&state, &state_callbacks, ConnectionState::Connecting).await;
 
             let url = format!(
-                "{}/ws/runner/{}/?token={}",
+                "{}/ws/runner/{}/?token={}&frames=binary",
                 settings.control_plane.ws_url,
                 settings.runner.id,
                 settings.runner.token
@@ -478,6 +478,25 @@ impl WebSocketClient {
                                 }
                             }
                         }
+                        Some(Ok(WsMessage::Binary(data))) => {
+                            // Sent by the control plane when connected with frames=binary
+                            match serde_json::from_slice::<IncomingMessage>(&data) {
+                                Ok(message) => {
+                                    *last_pong.write().await = Instant::now();
+
+                                    if incoming_tx.send(message).await.is_err() {
+                                        warn!("Failed to forward incoming message");
+                                    }
+                                }
+                                Err(e) => {
+                                    warn!(
+                                        "Failed to parse message: {} - {}",
+                                        e,
+                                        String::from_utf8_lossy(&data)
+                                    );
+                                }
+                            }
+                        }
                         Some(Ok(WsMessage::Ping(data))) => {
                             debug!("Received ping, sending pong");
                             sender.send(WsMessage::Pong(data)).await?;